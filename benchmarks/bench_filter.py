@@ -0,0 +1,70 @@
+"""
+Throughput benchmark for JobFilter on synthetic rows.
+
+    python -m benchmarks.bench_filter --rows 1000000
+"""
+import argparse
+import random
+import time
+import pandas as pd
+from utils.filter import JobFilter
+
+ROLES = [
+    "UI Designer Intern", "UX Research Internship", "Product Design Intern",
+    "Frontend Engineer Intern", "Game Designer Intern", "Backend Engineer Intern",
+    "Data Science Intern", "Unity Developer Intern", "Marketing Intern",
+    "Senior Frontend   Developer\n", "Build Engineer Intern", "Product Manager Intern"
+]
+TAGS = ["design, figma", "react, typescript", "python, sql", "c#, unity", "marketing", ""]
+
+def synthetic_frame(rows, seed=42):
+    rng = random.Random(seed)
+    return pd.DataFrame({
+        "Company": [f"Company {rng.randint(1, 5000)}" for _ in range(rows)],
+        "Role": [rng.choice(ROLES) for _ in range(rows)],
+        "Tags": [rng.choice(TAGS) for _ in range(rows)],
+        "Location": [rng.choice(["Remote", "New York, NY", "Berlin", "Anywhere"]) for _ in range(rows)]
+    })
+
+def legacy_filter(job_filter, df):
+    """The previous row-wise implementation, kept for comparison."""
+    for col in df.select_dtypes(include=['object', 'string']).columns:
+        df[col] = df[col].apply(job_filter.clean_text)
+
+    def is_relevant(role):
+        role = role.lower()
+        if any(ex in role for ex in job_filter.exclude_keywords):
+            return False
+        return any(kw in role for kw in job_filter.keywords)
+
+    return df[df['Role'].apply(is_relevant)]
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--legacy-rows", type=int, default=200_000,
+                        help="rows for the row-wise baseline (it is slow)")
+    args = parser.parse_args()
+
+    df = synthetic_frame(args.rows)
+    job_filter = JobFilter(match_fields=["Role"])
+
+    kept, elapsed = timed(job_filter.filter_jobs, df.copy())
+    print(f"vectorized: {args.rows:,} rows in {elapsed:.2f}s "
+          f"({args.rows / elapsed:,.0f} rows/s), kept {len(kept):,}")
+
+    sample = df.head(args.legacy_rows)
+    legacy_kept, legacy_elapsed = timed(legacy_filter, job_filter, sample.copy())
+    print(f"row-wise:   {len(sample):,} rows in {legacy_elapsed:.2f}s "
+          f"({len(sample) / legacy_elapsed:,.0f} rows/s), kept {len(legacy_kept):,}")
+
+    check = job_filter.filter_jobs(sample.copy())
+    assert check.index.equals(legacy_kept.index), "vectorized result differs from row-wise result"
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""
+Offline benchmark of the processing stages (filter, score + dedup, notify,
+sync) on synthetic job corpora. The Google Sheet is an in-memory fake
+worksheet and Telegram is a local HTTP endpoint, so nothing leaves the
+machine. Time and peak memory per stage go to a JSON file; pass an earlier
+file as --baseline to flag regressions between commits.
+
+    python -m benchmarks.bench_pipeline --sizes 1000,10000,100000,1000000 --dup-rate 0.15
+    python -m benchmarks.bench_pipeline --output new.json --baseline old.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Keep the benchmark's seen-jobs index and caches out of the real data dir
+os.environ.setdefault("DATA_DIR", tempfile.mkdtemp(prefix="bench_pipeline_"))
+os.environ.setdefault("SEEN_INDEX_PATH", os.path.join(os.environ["DATA_DIR"], "seen_jobs.sqlite3"))
+
+import numpy as np
+import pandas as pd
+from utils.logger import logger
+from utils.filter import JobFilter
+from utils.scoring import JobScorer
+from utils.dedup import job_deduplicator
+from utils.notifier import TelegramNotifier
+from utils.sheets import InternshipTracker
+
+# Weighted distributions loosely matching what the scrapers return
+SOURCES = {"Indeed": 0.35, "RemoteOK": 0.2, "Remotive": 0.15, "WeWorkRemotely": 0.12,
+           "Wellfound": 0.1, "YC Jobs": 0.08}
+LOCATIONS = {"Remote": 0.4, "Anywhere": 0.1, "Worldwide": 0.05, "New York, NY": 0.1,
+             "San Francisco, CA": 0.1, "Berlin": 0.05, "London, UK": 0.05, "Remote (US only)": 0.1,
+             "Bangalore, India": 0.05}
+TAGS = {"design, figma": 0.2, "react, typescript": 0.2, "product, research": 0.1, "python, sql": 0.15,
+        "c#, unity": 0.05, "marketing": 0.1, "Indeed, Internship": 0.15, "": 0.05}
+ROLES = {
+    "UI Designer Intern": 0.1, "UX Research Internship": 0.08, "Product Design Intern": 0.1,
+    "Frontend Engineer Intern": 0.12, "Senior Frontend Developer": 0.04, "UI/UX Intern (Visa Sponsorship)": 0.04,
+    "Product Manager Intern - Startup": 0.06, "Game Designer Intern": 0.04, "Unity Developer Intern": 0.03,
+    "Backend Engineer Intern": 0.12, "Data Science Intern": 0.12, "Marketing Intern": 0.1,
+    "Build Engineer Intern": 0.05
+}
+REMOTE = {"Remote": 0.5, "On-site/Hybrid": 0.3, None: 0.2}
+TRACKING_SUFFIXES = ["?utm_source=newsletter", "?ref=remoteok", "?utm_campaign=jobs&utm_medium=email"]
+
+def _choice(rng, dist, size):
+    values = list(dist)
+    picks = rng.choice(len(values), size=size, p=np.array(list(dist.values())) / sum(dist.values()))
+    return [values[i] for i in picks]
+
+def synthetic_jobs(rows, dup_rate=0.1, seed=42, run_id=0):
+    """
+    A corpus of `rows` scraped jobs. About `dup_rate` of them repost an
+    earlier job: same link with tracking parameters, or the same company
+    with a lightly edited title, usually under another source.
+    """
+    rng = np.random.default_rng(seed)
+    py_rng = random.Random(seed)
+    companies = [f"Company {i}" for i in rng.integers(1, max(rows // 4, 50), size=rows)]
+    df = pd.DataFrame({
+        "Company": companies,
+        "Role": _choice(rng, ROLES, rows),
+        "Location": _choice(rng, LOCATIONS, rows),
+        "Remote/On-site": _choice(rng, REMOTE, rows),
+        "Tags": _choice(rng, TAGS, rows),
+        # run_id keeps links unique across runs sharing one seen-jobs index
+        "Apply Link": [f"https://jobs.example.com/r{run_id}/job/{i}" for i in range(rows)],
+        "Date": [(datetime(2026, 1, 1) + timedelta(hours=int(h))).isoformat()
+                 for h in rng.integers(0, 24 * 90, size=rows)],
+        "Source": _choice(rng, SOURCES, rows)
+    })
+
+    duplicates = np.flatnonzero(rng.random(rows) < dup_rate)
+    duplicates = duplicates[duplicates > 0]
+    originals = (rng.random(len(duplicates)) * duplicates).astype(int)
+    company, role, link = (df.columns.get_loc(c) for c in ("Company", "Role", "Apply Link"))
+    for dup, orig in zip(duplicates.tolist(), originals.tolist()):
+        df.iat[dup, company] = df.iat[orig, company]
+        if py_rng.random() < 0.5:
+            df.iat[dup, link] = df.iat[orig, link] + py_rng.choice(TRACKING_SUFFIXES)
+            df.iat[dup, role] = df.iat[orig, role]
+        else:
+            df.iat[dup, role] = df.iat[orig, role].upper() if py_rng.random() < 0.5 else df.iat[orig, role] + " "
+    return df
+
+class FakeWorksheet:
+    """In-memory stand-in for the gspread Worksheet calls the tracker makes."""
+
+    def __init__(self, header):
+        self.rows = [list(header)]
+
+    def append_rows(self, rows, value_input_option=None):
+        first = len(self.rows) + 1
+        self.rows.extend(rows)
+        return {"updates": {"updatedRange": f"'Internship Tracker'!A{first}:I{len(self.rows)}"}}
+
+    def append_row(self, row, value_input_option=None):
+        return self.append_rows([row], value_input_option)
+
+    def get(self, cell_range):
+        # Only the single-column "E2:E" shape used by reconcile()
+        match = re.match(r"([A-Z]+)(\d+):[A-Z]+$", cell_range)
+        column = ord(match.group(1)) - ord("A")
+        return [[row[column]] for row in self.rows[int(match.group(2)) - 1:]]
+
+class FakeTelegram:
+    """Local HTTP endpoint that accepts sendMessage calls like the Bot API."""
+
+    def __init__(self):
+        self.messages = []
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                fake.messages.append(json.loads(body or b"{}"))
+                payload = json.dumps({"ok": True, "result": {"message_id": len(fake.messages)}}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/botFAKE/sendMessage"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+
+def run_stages(df, scorer, job_filter, notifier, tracker, measure_memory):
+    """Runs filter -> score -> notify -> sync once; returns per-stage results."""
+    stages = [
+        ("filter", job_filter.filter_jobs),
+        ("score", scorer.process),
+        ("notify", lambda d: (notifier.send_notification(d[d["Priority"] == "High"]), d)[1]),
+        ("sync", lambda d: (tracker.sync_jobs(d), d)[1])
+    ]
+    results = {}
+    data = df
+    for name, stage in stages:
+        rows_in = len(data)
+        if measure_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        data = stage(data)
+        elapsed = time.perf_counter() - started
+        peak = None
+        if measure_memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        results[name] = {
+            "rows_in": rows_in,
+            "rows_out": len(data),
+            "seconds": round(elapsed, 4),
+            "rows_per_second": round(rows_in / elapsed) if elapsed else None,
+            "peak_mb": round(peak / 2 ** 20, 2) if peak is not None else None
+        }
+    return results
+
+def bench_size(rows, dup_rate, seed, run_id, telegram, memory):
+    """Times the stages on one corpus size, then re-runs them under tracemalloc."""
+    job_filter = JobFilter(match_fields=["Role"])
+    scorer = JobScorer()
+    notifier = TelegramNotifier()
+    notifier.token, notifier.chat_id, notifier.base_url = "FAKE", "1", telegram.url
+    # Time the delivery itself, not just the hand-off to the sender thread
+    notifier.asynchronous = False
+    notifier.max_jobs = rows
+    tracker = InternshipTracker()
+    tracker.sheet = FakeWorksheet(tracker.columns)
+    tracker.sheet_name = f"bench-{run_id}"
+
+    passes = [False, True] if memory else [False]
+    results = {}
+    for index, measure_memory in enumerate(passes):
+        # Fresh job history and fresh links for every pass
+        job_deduplicator.reset()
+        df = synthetic_jobs(rows, dup_rate, seed, run_id=f"{run_id}-{index}")
+        stages = run_stages(df, scorer, job_filter, notifier, tracker, measure_memory)
+        for name, stage in stages.items():
+            if not measure_memory:
+                results[name] = stage
+            else:
+                results[name]["peak_mb"] = stage["peak_mb"]
+    return results
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(report, baseline, tolerance):
+    """Prints per-stage slowdowns vs. `baseline`; returns True if any exceed `tolerance`."""
+    regressed = False
+    for size, stages in report["results"].items():
+        for name, stage in stages.items():
+            before = baseline.get("results", {}).get(size, {}).get(name)
+            if not before or not before["seconds"]:
+                continue
+            change = stage["seconds"] / before["seconds"] - 1
+            flag = ""
+            if change > tolerance:
+                regressed = True
+                flag = "  <-- regression"
+            print(f"{size:>9} {name:<7} {before['seconds']:>9.3f}s -> {stage['seconds']:>9.3f}s ({change:+.0%}){flag}")
+    return regressed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,100000",
+                        help="comma-separated corpus sizes (up to 1000000)")
+    parser.add_argument("--dup-rate", type=float, default=0.1, help="fraction of reposted jobs")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--output", default="bench_pipeline.json")
+    parser.add_argument("--baseline", help="earlier --output file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed slowdown vs. the baseline before failing (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    # Per-batch INFO lines would dominate the timings
+    logger.setLevel("WARNING")
+    telegram = FakeTelegram()
+    report = {
+        "commit": git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "dup_rate": args.dup_rate,
+        "seed": args.seed,
+        "results": {}
+    }
+    try:
+        for run_id, rows in enumerate(int(size) for size in args.sizes.split(",")):
+            results = bench_size(rows, args.dup_rate, args.seed, run_id, telegram, not args.no_memory)
+            report["results"][str(rows)] = results
+            for name, stage in results.items():
+                memory = f"{stage['peak_mb']:>8.1f} MB" if stage["peak_mb"] is not None else ""
+                print(f"{rows:>9,} {name:<7} {stage['rows_in']:>9,} -> {stage['rows_out']:>9,} rows "
+                      f"{stage['seconds']:>9.3f}s {memory}")
+    finally:
+        telegram.close()
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output} ({len(telegram.messages)} Telegram messages, commit {report['commit']})")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.tolerance):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Throughput benchmark for JobScorer against the previous row-wise scoring.
+
+    python -m benchmarks.bench_scoring --rows 1000000
+"""
+import argparse
+import random
+import time
+from benchmarks.bench_filter import synthetic_frame
+from utils.scoring import JobScorer
+
+def legacy_score(row):
+    """The previous per-row implementation, kept for comparison."""
+    visa = ["visa", "sponsor", "sponsorship", "h1b"]
+    remote = ["remote", "work from home", "anywhere"]
+    startup = ["startup", "early stage", "series a", "wellfound", "yc"]
+    preferred = ["uiux", "product design", "senior frontend"]
+    score = 0
+    role = str(row.get('Role', '')).lower()
+    location = str(row.get('Location', '')).lower()
+    source = str(row.get('Source', '')).lower()
+    if any(kw in role for kw in visa) or any(kw in location for kw in visa):
+        score += 3
+    if any(kw in location for kw in remote) or row.get('Remote/On-site', '') == 'Remote':
+        score += 2
+    if any(kw in source for kw in startup) or any(kw in role for kw in startup):
+        score += 1
+    if any(p in role for p in preferred):
+        score += 1
+    return score
+
+def scoring_frame(rows, seed=7):
+    rng = random.Random(seed)
+    df = synthetic_frame(rows, seed)
+    df["Source"] = [rng.choice(["RemoteOK", "Wellfound", "YC Jobs", "Indeed", "Remotive"]) for _ in range(rows)]
+    df["Remote/On-site"] = [rng.choice(["Remote", "On-site/Hybrid", None]) for _ in range(rows)]
+    df["Role"] = df["Role"] + [rng.choice(["", " (Visa Sponsorship)", " - Startup"]) for _ in range(rows)]
+    return df
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--legacy-rows", type=int, default=100_000,
+                        help="rows for the row-wise baseline (it is slow)")
+    args = parser.parse_args()
+
+    scorer = JobScorer()
+    df = scoring_frame(args.rows)
+
+    started = time.perf_counter()
+    scores = scorer.calculate_scores(df)
+    scorer.classify_priorities(scores)
+    elapsed = time.perf_counter() - started
+    print(f"rule table: {args.rows:,} rows in {elapsed:.2f}s ({args.rows / elapsed:,.0f} rows/s)")
+
+    sample = df.head(args.legacy_rows)
+    started = time.perf_counter()
+    legacy = sample.apply(legacy_score, axis=1)
+    legacy_elapsed = time.perf_counter() - started
+    print(f"row-wise:   {len(sample):,} rows in {legacy_elapsed:.2f}s ({len(sample) / legacy_elapsed:,.0f} rows/s)")
+
+    assert (scorer.calculate_scores(sample) == legacy).all(), "rule table scores differ from row-wise scores"
+
+if __name__ == "__main__":
+    main()
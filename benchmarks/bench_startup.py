@@ -0,0 +1,109 @@
+"""
+Startup-time benchmark: runs each command in a fresh interpreter `--runs`
+times and reports the median wall time, plus which heavy dependencies a
+bare `import main` pulls in. Pass an earlier --output as --baseline to
+flag regressions (e.g. a new module-level import of pandas).
+
+    python -m benchmarks.bench_startup --runs 10
+    python -m benchmarks.bench_startup --output new.json --baseline old.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ["pandas", "numpy", "gspread", "oauth2client", "playwright", "requests", "lxml"]
+
+COMMANDS = {
+    "python": ["-c", "pass"],
+    "import_main": ["-c", "import main"],
+    "cli_help": ["main.py", "--help"]
+}
+
+def time_command(args, runs, env):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable] + args, cwd=ROOT, env=env, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        samples.append(time.perf_counter() - started)
+    return {"median_seconds": round(statistics.median(samples), 4), "min_seconds": round(min(samples), 4)}
+
+def heavy_imports(env):
+    """Heavy modules present in sys.modules after `import main`."""
+    code = f"import sys, main; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, check=True,
+                         capture_output=True, text=True).stdout.strip()
+    return [name for name in out.split(",") if name]
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(report, baseline, tolerance):
+    """Prints per-command slowdowns vs. `baseline`; returns True if any exceed `tolerance`."""
+    regressed = False
+    for name, result in report["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if not before or not before["median_seconds"]:
+            continue
+        change = result["median_seconds"] / before["median_seconds"] - 1
+        flag = ""
+        if change > tolerance:
+            regressed = True
+            flag = "  <-- regression"
+        print(f"{name:<12} {before['median_seconds']:>8.3f}s -> {result['median_seconds']:>8.3f}s "
+              f"({change:+.0%}){flag}")
+    return regressed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--output", default="bench_startup.json")
+    parser.add_argument("--baseline", help="earlier --output file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed slowdown vs. the baseline before failing (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    # Keep logs and local state of the measured processes out of the repo
+    scratch = tempfile.mkdtemp(prefix="bench_startup_")
+    env = dict(os.environ, DATA_DIR=scratch, LOG_FILE=os.path.join(scratch, "app.log"))
+
+    report = {
+        "commit": git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "runs": args.runs,
+        "heavy_imports": heavy_imports(env),
+        "results": {}
+    }
+    for name, command in COMMANDS.items():
+        result = time_command(command, args.runs, env)
+        report["results"][name] = result
+        print(f"{name:<12} {result['median_seconds']:>8.3f}s median, {result['min_seconds']:.3f}s min")
+    print(f"Heavy modules loaded by `import main`: {', '.join(report['heavy_imports']) or 'none'}")
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output} (commit {report['commit']})")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.tolerance):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+import json
 import os
 from dotenv import load_dotenv
 
@@ -8,15 +9,130 @@ class Settings:
     # Google Sheets
     GOOGLE_SHEETS_CREDENTIAL_FILE = os.getenv("GOOGLE_SHEETS_CREDENTIAL_FILE", "config/credentials.json")
     SPREADSHEET_ID = os.getenv("SPREADSHEET_ID")
+    # Re-read the sheet for dedup reconciliation at most this often
+    SHEETS_RECONCILE_HOURS = float(os.getenv("SHEETS_RECONCILE_HOURS", "24"))
+
+    # Local state (seen-jobs index, caches)
+    DATA_DIR = os.getenv("DATA_DIR", "data")
+    SEEN_INDEX_PATH = os.getenv("SEEN_INDEX_PATH", os.path.join(DATA_DIR, "seen_jobs.sqlite3"))
+
+    # Listing fingerprint cache: skip cards already seen on a source's listing
+    LISTING_CACHE = os.getenv("LISTING_CACHE", "true").lower() == "true"
+    LISTING_CACHE_PATH = os.getenv("LISTING_CACHE_PATH", os.path.join(DATA_DIR, "listing_cache.json"))
+    LISTING_CACHE_TTL_HOURS = float(os.getenv("LISTING_CACHE_TTL_HOURS", "6"))
+
+    # Incremental crawl: paginate deep on the first run, then stop at each
+    # source's watermark (the newest postings seen last time)
+    INCREMENTAL_CRAWL = os.getenv("INCREMENTAL_CRAWL", "true").lower() == "true"
 
     # Scraper
     SCRAPE_INTERVAL_MINUTES = int(os.getenv("SCRAPE_INTERVAL_MINUTES", "60"))
 
+    # Adaptive per-source schedule: SCRAPE_INTERVAL_MINUTES is the starting
+    # interval, then each source aims for SCHEDULE_TARGET_NEW_JOBS per run
+    SCHEDULE_MIN_INTERVAL_MINUTES = float(os.getenv("SCHEDULE_MIN_INTERVAL_MINUTES", "15"))
+    SCHEDULE_MAX_INTERVAL_MINUTES = float(os.getenv("SCHEDULE_MAX_INTERVAL_MINUTES", "1440"))
+    SCHEDULE_TARGET_NEW_JOBS = float(os.getenv("SCHEDULE_TARGET_NEW_JOBS", "5"))
+    SCHEDULE_JITTER = float(os.getenv("SCHEDULE_JITTER", "0.1"))
+
+    # Circuit breaker per source (scraper/health.py): skip a source after this
+    # many failed (or empty) runs in a row, probe it again after the cooldown.
+    # Sources with BREAKER_TIGHTEN_AFTER bad runs in a row, and probes, get
+    # Playwright timeouts cut to BREAKER_TIGHTENED_TIMEOUT_MS.
+    BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "3"))
+    BREAKER_ZERO_RESULT_THRESHOLD = int(os.getenv("BREAKER_ZERO_RESULT_THRESHOLD", "3"))
+    BREAKER_COOLDOWN_MINUTES = float(os.getenv("BREAKER_COOLDOWN_MINUTES", "60"))
+    BREAKER_TIGHTEN_AFTER = int(os.getenv("BREAKER_TIGHTEN_AFTER", "2"))
+    BREAKER_TIGHTENED_TIMEOUT_MS = int(os.getenv("BREAKER_TIGHTENED_TIMEOUT_MS", "10000"))
+
+    # Browser pool: relaunch Chromium after this many scraper contexts
+    BROWSER_MAX_USES = int(os.getenv("BROWSER_MAX_USES", "10"))
+
+    # Keyword filter: fields searched and whole-word matching
+    FILTER_MATCH_FIELDS = [f.strip() for f in os.getenv("FILTER_MATCH_FIELDS", "Role").split(",") if f.strip()]
+    FILTER_WORD_BOUNDARY = os.getenv("FILTER_WORD_BOUNDARY", "false").lower() == "true"
+
+    # Optional JSON file overriding the scoring weight table (utils/scoring.py)
+    SCORING_RULES_FILE = os.getenv("SCORING_RULES_FILE")
+
+    # Fuzzy dedup: minimum title similarity (Jaccard) for same-company postings
+    DEDUP_TITLE_THRESHOLD = float(os.getenv("DEDUP_TITLE_THRESHOLD", "0.8"))
+    # Reposts of the newest this-many synced jobs are dropped (seen-jobs index)
+    DEDUP_HISTORY_SIZE = int(os.getenv("DEDUP_HISTORY_SIZE", "50000"))
+
+    # Execution mode: "sync" (one source at a time), "async" (concurrent) or
+    # "queue" (tasks run by worker processes, see scraper/work_queue.py)
+    SCRAPE_MODE = os.getenv("SCRAPE_MODE", "sync")
+    SCRAPE_CONCURRENCY = int(os.getenv("SCRAPE_CONCURRENCY", "3"))
+    SCRAPE_SOURCE_TIMEOUT_SECONDS = int(os.getenv("SCRAPE_SOURCE_TIMEOUT_SECONDS", "90"))
+
+    # Extra search terms per source, as JSON, e.g.
+    # {"Indeed": ["ux design internship", "frontend internship"]}
+    SOURCE_QUERIES = json.loads(os.getenv("SOURCE_QUERIES", "{}"))
+
+    # Work queue (SCRAPE_MODE=queue): workers on other hosts run
+    # `python main.py --worker` against the same queue file. The orchestrator
+    # also starts WORK_QUEUE_LOCAL_WORKERS of its own (0 = external only),
+    # each logging to LOG_FILE with a .worker-N suffix. Give external
+    # workers sharing a directory their own LOG_FILE too.
+    WORK_QUEUE_PATH = os.getenv("WORK_QUEUE_PATH", os.path.join(DATA_DIR, "work_queue.sqlite3"))
+    WORK_QUEUE_LOCAL_WORKERS = int(os.getenv("WORK_QUEUE_LOCAL_WORKERS", "2"))
+    WORK_QUEUE_TIMEOUT_SECONDS = int(os.getenv("WORK_QUEUE_TIMEOUT_SECONDS", "600"))
+    WORK_QUEUE_MAX_ATTEMPTS = int(os.getenv("WORK_QUEUE_MAX_ATTEMPTS", "2"))
+    # Split paged sources into one task per result page
+    WORK_QUEUE_SHARD_PAGES = os.getenv("WORK_QUEUE_SHARD_PAGES", "true").lower() == "true"
+
+    # Pipeline mode: "batch" (scrape everything, then process) or "streaming"
+    # (filter/score/notify/sync micro-batches while sources are still loading)
+    PIPELINE_MODE = os.getenv("PIPELINE_MODE", "batch")
+    STREAM_BATCH_SIZE = int(os.getenv("STREAM_BATCH_SIZE", "25"))
+    STREAM_MAX_PENDING_BATCHES = int(os.getenv("STREAM_MAX_PENDING_BATCHES", "8"))
+
+    # Block images/fonts/media/trackers in scraper pages
+    BLOCK_RESOURCES = os.getenv("BLOCK_RESOURCES", "true").lower() == "true"
+
+    # HTTP-first fetching for server-rendered sources (browser is the fallback)
+    HTTP_FIRST = os.getenv("HTTP_FIRST", "true").lower() == "true"
+    HTTP_TIMEOUT_SECONDS = int(os.getenv("HTTP_TIMEOUT_SECONDS", "15"))
+
+    # Network record/replay: "off", "record" or "replay" (see scraper/har.py);
+    # usually set with main.py --record / --replay
+    HAR_MODE = os.getenv("HAR_MODE", "off")
+    HAR_DIR = os.getenv("HAR_DIR", os.path.join("fixtures", "har"))
+
+    # Metrics export after every cycle (empty path disables that output)
+    METRICS_TEXTFILE = os.getenv("METRICS_TEXTFILE", os.path.join(DATA_DIR, "metrics", "job_automation.prom"))
+    METRICS_SUMMARY = os.getenv("METRICS_SUMMARY", os.path.join(DATA_DIR, "metrics", "last_run.json"))
+
+    # Profile one cycle and exit: "cpu", "memory" or "cpu,memory" (see
+    # utils/profiling.py); also main.py --profile
+    PROFILE = os.getenv("PROFILE", "")
+    PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(DATA_DIR, "profiles"))
+
     # Logging
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    LOG_FILE = os.getenv("LOG_FILE", "app.log")
+    # "text" or "json" (JSON lines with source/stage fields) for the log file
+    LOG_FORMAT = os.getenv("LOG_FORMAT", "text")
+    # Rotation: "size" (LOG_MAX_BYTES) or "time" (LOG_ROTATE_WHEN, e.g. "midnight")
+    LOG_ROTATION = os.getenv("LOG_ROTATION", "size")
+    LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+    LOG_ROTATE_WHEN = os.getenv("LOG_ROTATE_WHEN", "midnight")
+    LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+    # Noisy per-row lines (logged with extra={"rate_limit": True}): at most
+    # this many per source and message per window (0 disables)
+    LOG_RATE_LIMIT_BURST = int(os.getenv("LOG_RATE_LIMIT_BURST", "5"))
+    LOG_RATE_LIMIT_SECONDS = float(os.getenv("LOG_RATE_LIMIT_SECONDS", "60"))
 
     # Telegram
     TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
     TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
+    # Send on a background thread so a slow Bot API never stalls the cycle
+    TELEGRAM_ASYNC = os.getenv("TELEGRAM_ASYNC", "true").lower() == "true"
+    TELEGRAM_MAX_JOBS = int(os.getenv("TELEGRAM_MAX_JOBS", "10"))
+    TELEGRAM_TIMEOUT_SECONDS = float(os.getenv("TELEGRAM_TIMEOUT_SECONDS", "10"))
+    TELEGRAM_MAX_RETRIES = int(os.getenv("TELEGRAM_MAX_RETRIES", "3"))
+    # Jobs already alerted, so each job is sent once
+    NOTIFIED_INDEX_PATH = os.getenv("NOTIFIED_INDEX_PATH", os.path.join(DATA_DIR, "notified_jobs.sqlite3"))
 
 settings = Settings()
@@ -1,24 +1,45 @@
-import schedule
+import argparse
+import hashlib
+import importlib
+import json
+import os
+import subprocess
 import time
 import sys
-import pandas as pd
+import uuid
 from typing import List
 
+# Only light modules here: pandas, gspread, requests and Playwright (and the
+# filter/scoring/notifier/sheets singletons) are imported by the stage
+# that uses them, so `--help`, `--dry-run` and cron runs start fast.
 from config.settings import settings
 from utils.logger import logger
-from utils.sheets import tracker
-from utils.filter import job_filter
-from utils.scoring import job_scorer
-from utils.notifier import notifier
-
-# Scrapers
-from scraper.remoteok import RemoteOKScraper
-from scraper.remotive import RemotiveScraper
-from scraper.weworkremotely import WeWorkRemotelyScraper
-from scraper.wellfound import WellfoundScraper
-from scraper.yc_jobs import YCJobsScraper
-from scraper.indeed import IndeedScraper
+from utils.pipeline import StreamingPipeline
+from utils.metrics import metrics
+from utils.scheduler import AdaptiveScheduler
 from scraper.base_scraper import BaseScraper
+from scraper.browser_pool import BrowserPool
+from scraper.async_engine import AsyncScrapeEngine
+from scraper.health import health_tracker
+from scraper.work_queue import WorkQueue, run_worker as run_queue_worker
+
+# Scrapers, by the name used with --sources
+SOURCES = {
+    "remoteok": ("scraper.remoteok", "RemoteOKScraper"),
+    "remotive": ("scraper.remotive", "RemotiveScraper"),
+    "weworkremotely": ("scraper.weworkremotely", "WeWorkRemotelyScraper"),
+    "wellfound": ("scraper.wellfound", "WellfoundScraper"),
+    "yc": ("scraper.yc_jobs", "YCJobsScraper"),
+    "indeed": ("scraper.indeed", "IndeedScraper")
+}
+
+def load_scrapers(names=None) -> List[BaseScraper]:
+    """Instantiates the scrapers in `names` (default: all), importing only their modules."""
+    scrapers = []
+    for name in names or SOURCES:
+        module, cls = SOURCES[name]
+        scrapers.append(getattr(importlib.import_module(module), cls)())
+    return scrapers
 
 class JobAutomationOrchestrator:
     """
@@ -26,90 +47,474 @@ class JobAutomationOrchestrator:
     Scrape -> Combine -> Filter -> Score -> Notify -> Sync
     """
     
-    def __init__(self):
-        self.scrapers: List[BaseScraper] = [
-            RemoteOKScraper(),
-            RemotiveScraper(),
-            WeWorkRemotelyScraper(),
-            WellfoundScraper(),
-            YCJobsScraper(),
-            IndeedScraper()
-        ]
+    def __init__(self, sources=None, notify=True, sync=True, dry_run=False):
+        self.scrapers: List[BaseScraper] = load_scrapers(sources)
+        # Stages that can be switched off from the command line
+        self.notify = notify
+        self.sync = sync
+        # Leaves breaker state and the metrics files untouched
+        self.dry_run = dry_run
+        # Scored jobs of the last batch-mode cycle (printed by --dry-run)
+        self.last_result = None
+        # One Chromium for the whole scrape phase, one context per scraper
+        self.browser_pool = BrowserPool(max_uses=settings.BROWSER_MAX_USES)
 
-    def run_cycle(self):
-        """Executes one full automation cycle."""
+    def run_cycle(self, scrapers: List[BaseScraper] = None) -> List[BaseScraper]:
+        """
+        Executes one full automation cycle over `scrapers` (default: all).
+        Sources whose circuit breaker is open are skipped; returns the
+        scrapers that actually ran. Crawl state (watermarks, listing
+        fingerprints) is only saved once the cycle's jobs are synced.
+        """
+        scrapers = self.scrapers if scrapers is None else scrapers
         logger.info("=" * 50)
         logger.info("Starting Job Automation Cycle")
         logger.info("=" * 50)
-        
+        metrics.begin_run()
+        if not self.dry_run:
+            scrapers = [scraper for scraper in scrapers if health_tracker.allow(scraper)]
+
+        synced = False
         try:
-            # 1. Scrape all sources
-            raw_jobs = self._scrape_all()
-            if not raw_jobs:
-                logger.warning("No jobs found in this cycle. Skipping processing.")
-                return
-
-            # 2. Filter and Normalize
-            logger.info(f"Filtering {len(raw_jobs)} raw listings...")
+            with metrics.span("cycle"):
+                synced = self._run_stages(scrapers)
+        except Exception as e:
+            logger.critical(f"FATAL: Critical error in automation cycle: {e}", exc_info=True)
+        finally:
+            if not synced and any(scraper.has_pending_state for scraper in scrapers):
+                logger.warning("Jobs were not synced; keeping the previous crawl state so they are re-read.")
+            for scraper in scrapers:
+                if synced:
+                    scraper.commit_state()
+                else:
+                    scraper.discard_state()
+            if not self.dry_run:
+                for scraper in scrapers:
+                    health_tracker.record(scraper)
+                health_tracker.report([scraper.name for scraper in scrapers])
+            self._export_metrics()
+        return scrapers
+
+    def _run_stages(self, scrapers) -> bool:
+        """Runs scrape -> sync; returns True when every relevant job reached the tracker."""
+        if settings.PIPELINE_MODE == "streaming":
+            stats = self._run_streaming(scrapers)
+            logger.info("Cycle completed successfully.")
+            return self.sync and not stats["failed_batches"]
+
+        # 1. Scrape all sources
+        with metrics.span("scrape_all"):
+            raw_jobs = self._scrape_all(scrapers)
+        if not raw_jobs:
+            logger.warning("No jobs found in this cycle. Skipping processing.")
+            return True
+
+        from utils.filter import job_filter
+        from utils.scoring import job_scorer
+
+        # 2. Filter and Normalize
+        logger.info(f"Filtering {len(raw_jobs)} raw listings...")
+        with metrics.span("filter"):
             filtered_df = job_filter.filter_jobs(raw_jobs)
-            if filtered_df.empty:
-                logger.info("No relevant jobs found after filtering.")
-                return
+        metrics.inc("jobs_relevant_total", len(filtered_df))
+        if filtered_df.empty:
+            logger.info("No relevant jobs found after filtering.")
+            return True
 
-            # 3. Deduplicate and Score
-            logger.info("Applying scoring and local deduplication...")
+        # 3. Deduplicate and Score
+        logger.info("Applying scoring and local deduplication...")
+        with metrics.span("score"):
             processed_df = job_scorer.process(filtered_df)
-            
-            # 4. Notify via Telegram (Top 5 High-Priority)
+        metrics.inc("jobs_unique_total", len(processed_df))
+        self.last_result = processed_df
+
+        # 4. Notify via Telegram (Top 5 High-Priority)
+        if self.notify:
+            from utils.notifier import notifier
+
             logger.info("Sending notifications for top opportunities...")
-            notifier.send_notification(processed_df)
+            with metrics.span("notify"):
+                notifier.send_notification(processed_df)
+
+        # 5. Sync to Google Sheets (Cloud deduplication happens here)
+        synced = False
+        if self.sync:
+            from utils.sheets import tracker
 
-            # 5. Sync to Google Sheets (Cloud deduplication happens here)
             logger.info("Syncing with Google Sheets Tracker...")
-            tracker.sync_jobs(processed_df)
+            with metrics.span("sync"):
+                synced = tracker.sync_jobs(processed_df)
 
-            logger.info("Cycle completed successfully.")
-            
-        except Exception as e:
-            logger.critical(f"FATAL: Critical error in automation cycle: {e}", exc_info=True)
+        logger.info("Cycle completed successfully.")
+        return synced
 
-    def _scrape_all(self) -> List[dict]:
-        """Runs all scrapers and collects results."""
-        all_jobs = []
-        for scraper in self.scrapers:
-            try:
+    def _export_metrics(self):
+        """Logs where the cycle's time went and writes the metrics files."""
+        summary = metrics.run_summary()
+        metrics.set_gauge("last_cycle_duration_seconds", summary["duration_seconds"])
+        metrics.set_gauge("last_cycle_timestamp_seconds", round(time.time()))
+        slowest = sorted(summary["totals"].items(), key=lambda item: item[1], reverse=True)
+        logger.info("Cycle timings: " + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in slowest))
+        if not self.dry_run:
+            metrics.export()
+
+    def _run_streaming(self, scrapers):
+        """Runs the cycle as a stream of micro-batches (see utils/pipeline.py)."""
+        from utils.filter import job_filter
+        from utils.scoring import job_scorer
+
+        notifier = tracker = None
+        if self.notify:
+            from utils.notifier import notifier
+        if self.sync:
+            from utils.sheets import tracker
+        pipeline = StreamingPipeline(
+            job_filter, job_scorer, notifier, tracker,
+            batch_size=settings.STREAM_BATCH_SIZE,
+            max_pending=settings.STREAM_MAX_PENDING_BATCHES
+        )
+        return pipeline.run(lambda emit: self._produce_batches(scrapers, emit))
+
+    def _produce_batches(self, scrapers, emit):
+        """Producer side of the streaming pipeline; runs on a worker thread."""
+        if settings.SCRAPE_MODE == "async":
+            engine = AsyncScrapeEngine(
+                concurrency=settings.SCRAPE_CONCURRENCY,
+                default_budget=settings.SCRAPE_SOURCE_TIMEOUT_SECONDS,
+                browser_max_uses=settings.BROWSER_MAX_USES
+            )
+            engine.run(scrapers, on_result=lambda scraper, jobs: emit(scraper.name, jobs))
+            return
+        if settings.SCRAPE_MODE == "queue":
+            self._scrape_all_queue(scrapers, on_result=lambda scraper, jobs: emit(scraper.name, jobs))
+            return
+
+        # The pool is started on this thread, as sync Playwright requires
+        with self.browser_pool:
+            for scraper in scrapers:
                 logger.info(f"Running scraper: {scraper.name}")
-                jobs = scraper.run()
-                all_jobs.extend(jobs)
-                logger.info(f"Successfully fetched {len(jobs)} jobs from {scraper.name}")
-            except Exception as e:
-                logger.error(f"Error running scraper {scraper.name}: {e}")
-                # Continue with other scrapers if one fails
-                continue
+                for batch in scraper.stream(pool=self.browser_pool, batch_size=settings.STREAM_BATCH_SIZE):
+                    emit(scraper.name, batch)
+            logger.info(f"Browser pool stats: {self.browser_pool.stats()}")
+
+    def run_due(self, scheduler):
+        """Runs one cycle over the sources the scheduler says are due, then reports back."""
+        due = set(scheduler.due())
+        scrapers = [scraper for scraper in self.scrapers if scraper.name in due]
+        if not scrapers:
+            return
+        ran = self.run_cycle(scrapers)
+        for scraper in scrapers:
+            if scraper in ran:
+                scheduler.record(scraper.name, scraper.last_yield, ok=scraper.last_error is None)
+            else:
+                # Breaker open: come back when it allows a probe
+                scheduler.defer(scraper.name, health_tracker.retry_at(scraper.name))
+
+    def run_har_cycle(self, mode) -> bool:
+        """
+        Records or replays one scrape-only cycle (see scraper/har.py); nothing
+        is filtered, notified or synced. Per-source job counts, timings and a
+        digest of the parsed jobs go to HAR_DIR/summary-<mode>.json. Returns
+        False when a replay's digests differ from the recording.
+        """
+        settings.HAR_MODE = mode
+        # Full, deterministic listings: no watermark cut, no listing delta
+        settings.INCREMENTAL_CRAWL = False
+        settings.LISTING_CACHE = False
+        logger.info(f"Starting scrape-only {mode} cycle (HAR dir: {settings.HAR_DIR})")
+
+        summary = {}
+        with self.browser_pool:
+            for scraper in self.scrapers:
+                started = time.perf_counter()
+                jobs = scraper.run(pool=self.browser_pool)
+                payload = json.dumps([job.to_dict() for job in jobs], sort_keys=True).encode("utf-8")
+                summary[scraper.name] = {
+                    "jobs": len(jobs),
+                    "seconds": round(time.perf_counter() - started, 3),
+                    "digest": hashlib.sha1(payload).hexdigest()
+                }
+                logger.info(f"{scraper.name}: {len(jobs)} jobs in {summary[scraper.name]['seconds']}s")
+
+        os.makedirs(settings.HAR_DIR, exist_ok=True)
+        with open(os.path.join(settings.HAR_DIR, f"summary-{mode}.json"), "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        if mode != "replay":
+            return True
+
+        try:
+            with open(os.path.join(settings.HAR_DIR, "summary-record.json"), encoding="utf-8") as f:
+                recorded = json.load(f)
+        except FileNotFoundError:
+            logger.warning("No summary-record.json to compare the replay against.")
+            return True
+        changed = [name for name, result in summary.items()
+                   if name in recorded and recorded[name]["digest"] != result["digest"]]
+        for name in changed:
+            logger.error(f"{name}: replayed jobs differ from the recording "
+                         f"({recorded[name]['jobs']} recorded, {summary[name]['jobs']} replayed)")
+        return not changed
+
+    def run_profiled_cycle(self, modes):
+        """
+        Runs one cycle under utils/profiling.CycleProfiler. Scraping and
+        processing run one after another on this thread so that every scope
+        (scrape per source, filter, score, notify, sync) is profiled on its own.
+        """
+        from utils.profiling import CycleProfiler
+
+        settings.SCRAPE_MODE = "sync"
+        settings.PIPELINE_MODE = "batch"
+        output_dir = os.path.join(settings.PROFILE_DIR, time.strftime("%Y%m%d-%H%M%S"))
+        profiler = CycleProfiler(output_dir, modes=modes)
+        profiler.start()
+        try:
+            self.run_cycle()
+        finally:
+            profiler.stop()
+        return profiler.write()
+
+    def _scrape_all(self, scrapers: List[BaseScraper]) -> List[dict]:
+        """Runs the given scrapers and collects results."""
+        if settings.SCRAPE_MODE == "async":
+            return self._scrape_all_async(scrapers)
+        if settings.SCRAPE_MODE == "queue":
+            return self._scrape_all_queue(scrapers)
+        return self._scrape_all_sync(scrapers)
+
+    def _scrape_all_sync(self, scrapers: List[BaseScraper]) -> List[dict]:
+        """Runs scrapers one after another on the shared browser pool."""
+        all_jobs = []
+        with self.browser_pool:
+            for scraper in scrapers:
+                try:
+                    logger.info(f"Running scraper: {scraper.name}")
+                    jobs = scraper.run(pool=self.browser_pool)
+                    all_jobs.extend(jobs)
+                    logger.info(f"Successfully fetched {len(jobs)} jobs from {scraper.name}")
+                except Exception as e:
+                    scraper.last_error = e
+                    logger.error(f"Error running scraper {scraper.name}: {e}")
+                    # Continue with other scrapers if one fails
+                    continue
+            logger.info(f"Browser pool stats: {self.browser_pool.stats()}")
+        return all_jobs
+
+    def _scrape_all_async(self, scrapers: List[BaseScraper]) -> List[dict]:
+        """Runs scrapers concurrently, each bounded by its own time budget."""
+        engine = AsyncScrapeEngine(
+            concurrency=settings.SCRAPE_CONCURRENCY,
+            default_budget=settings.SCRAPE_SOURCE_TIMEOUT_SECONDS,
+            browser_max_uses=settings.BROWSER_MAX_USES
+        )
+        all_jobs = []
+        for scraper, jobs in engine.run(scrapers):
+            all_jobs.extend(jobs)
+            logger.info(f"Successfully fetched {len(jobs)} jobs from {scraper.name}")
+        return all_jobs
+
+    def _work_queue(self):
+        return WorkQueue(
+            settings.WORK_QUEUE_PATH,
+            lease_seconds=settings.SCRAPE_SOURCE_TIMEOUT_SECONDS * 2,
+            max_attempts=settings.WORK_QUEUE_MAX_ATTEMPTS
+        )
+
+    def _start_local_workers(self):
+        """
+        Starts WORK_QUEUE_LOCAL_WORKERS worker processes that exit once the
+        queue drains. Each logs to its own file (app.worker-1.log, ...):
+        rotating one file from several processes loses lines.
+        """
+        command = [sys.executable, os.path.abspath(__file__), "--worker", "--exit-when-idle", "5"]
+        root, ext = os.path.splitext(settings.LOG_FILE)
+        return [
+            subprocess.Popen(command, env=dict(os.environ, LOG_FILE=f"{root}.worker-{number}{ext}"))
+            for number in range(1, settings.WORK_QUEUE_LOCAL_WORKERS + 1)
+        ]
+
+    def _scrape_all_queue(self, scrapers: List[BaseScraper], on_result=None) -> List[dict]:
+        """
+        Fans the scrapers out as source x query x page tasks on the work
+        queue, waits for the workers, and aggregates each source as soon as
+        all of its tasks are finished. `on_result(scraper, jobs)` is called
+        per source, like the async engine's callback.
+        """
+        work_queue = self._work_queue()
+        work_queue.purge()
+        cycle = uuid.uuid4().hex[:12]
+        by_name = {scraper.name: scraper for scraper in scrapers}
+        work_queue.enqueue(cycle, [
+            (scraper.name, query, page, scraper.navigation_timeout_ms)
+            for scraper in scrapers for query, page in scraper.shards()
+        ])
+        workers = self._start_local_workers()
+        deadline = time.monotonic() + settings.WORK_QUEUE_TIMEOUT_SECONDS
+
+        all_jobs = []
+        remaining = set(by_name)
+        try:
+            while remaining:
+                unfinished = work_queue.unfinished(cycle)
+                if unfinished and time.monotonic() >= deadline:
+                    logger.error(f"Work queue deadline passed; giving up on {', '.join(sorted(unfinished))}")
+                    work_queue.cancel(cycle)
+                    unfinished = set()
+                for name in sorted(remaining - unfinished):
+                    scraper = by_name[name]
+                    jobs = self._aggregate(scraper, work_queue.results(cycle, name))
+                    remaining.discard(name)
+                    all_jobs.extend(jobs)
+                    logger.info(f"Successfully fetched {len(jobs)} jobs from {scraper.name}")
+                    if on_result is not None:
+                        on_result(scraper, jobs)
+                if remaining:
+                    time.sleep(0.5)
+        finally:
+            for worker in workers:
+                try:
+                    worker.wait(timeout=15)
+                except subprocess.TimeoutExpired:
+                    worker.terminate()
         return all_jobs
 
+    def _aggregate(self, scraper: BaseScraper, results: List[dict]) -> List[dict]:
+        """
+        Folds one source's task results into a single run: the watermark cut
+        per query (pages in order), then the listing delta over all of them.
+        """
+        scraper.discard_state()
+        failed = [result for result in results if result["error"] is not None]
+        for result in failed:
+            logger.warning(f"{scraper.name} task (query={result['query']}, page={result['page']}) "
+                           f"failed: {result['error']}")
+        # A source fails when none of its tasks got through
+        scraper.last_error = failed[0]["error"] if failed and len(failed) == len(results) else None
+        scraper.raw_keys = []
+        scraper.last_duration = sum(result["seconds"] for result in results)
+
+        by_query = {}
+        for result in results:
+            if result["jobs"]:
+                by_query.setdefault(result["query"], []).append(result["jobs"])
+
+        def cut():
+            for query, batches in by_query.items():
+                scraper.query = query
+                yield from scraper.until_watermark(scraper.count_raw(batches))
+
+        try:
+            # Validators come from the worker that fetched the built-in listing
+            validators = next((result["validators"] for result in results if result["validators"]), {})
+            jobs = [job for batch in scraper.listing_delta(cut(), validators=validators) for job in batch]
+        finally:
+            scraper.query = None
+        # Workers' counts: a 304 task reports the cached listing's size
+        scraper.last_raw_count = sum(result["raw_count"] for result in results)
+        scraper.last_yield = len(jobs)
+        metrics.record_span("scrape", scraper.last_duration, source=scraper.name)
+        metrics.inc("jobs_scraped_total", len(jobs), source=scraper.name)
+        return jobs
+
+    def run_worker(self, exit_when_idle=None):
+        """Work-queue worker: runs tasks queued by any orchestrator (see scraper/work_queue.py)."""
+        logger.info(f"Worker started on {settings.WORK_QUEUE_PATH}")
+        run_queue_worker(
+            {scraper.name: scraper for scraper in self.scrapers}, self._work_queue(),
+            self.browser_pool, exit_when_idle=exit_when_idle
+        )
+
+def _source_list(value):
+    names = [name.strip().lower() for name in value.split(",") if name.strip()]
+    unknown = [name for name in names if name not in SOURCES]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown source(s) {', '.join(unknown)}; choose from {', '.join(SOURCES)}"
+        )
+    return names
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Job search automation pipeline")
+    parser.add_argument("--once", action="store_true",
+                        help="run a single cycle and exit instead of scheduling")
+    parser.add_argument("--sources", type=_source_list, metavar="NAMES",
+                        help=f"comma-separated sources to scrape ({','.join(SOURCES)})")
+    parser.add_argument("--no-notify", action="store_true", help="skip Telegram notifications")
+    parser.add_argument("--no-sync", action="store_true", help="skip the Google Sheets sync")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="one cycle that scrapes, filters and scores, prints the top jobs and "
+                             "changes nothing (no notify, no sync; crawl state, circuit breakers "
+                             "and metrics files untouched)")
+    har_mode = parser.add_mutually_exclusive_group()
+    har_mode.add_argument("--record", action="store_true",
+                          help="scrape once and capture each source's traffic to HAR files")
+    har_mode.add_argument("--replay", action="store_true",
+                          help="scrape once, offline, serving every request from the HAR files")
+    parser.add_argument("--profile", nargs="?", const="cpu,memory", default=settings.PROFILE,
+                        metavar="MODES", help="run one cycle under cProfile and/or tracemalloc "
+                                              "(cpu, memory or cpu,memory) and write per-stage reports")
+    parser.add_argument("--worker", action="store_true",
+                        help="run scrape tasks from the work queue (SCRAPE_MODE=queue) instead of cycles")
+    parser.add_argument("--exit-when-idle", type=float, metavar="SECONDS",
+                        help="with --worker: exit after the queue has been empty this long")
+    return parser.parse_args(argv)
+
+def print_top_jobs(df, limit=20):
+    """Prints the best-scored jobs of a dry run."""
+    if df is None or df.empty:
+        print("No relevant jobs found.")
+        return
+    columns = [column for column in ("Score", "Priority", "Company", "Role", "Source", "Apply Link")
+               if column in df.columns]
+    print(df[columns].head(limit).to_string(index=False))
+    print(f"({len(df)} relevant jobs)")
+
 def main():
     """Main entry point."""
-    orchestrator = JobAutomationOrchestrator()
-    
-    # Run once immediately
-    orchestrator.run_cycle()
+    args = parse_args()
+    if args.dry_run:
+        # Full listings and no watermark/listing-cache updates, like a HAR run
+        settings.INCREMENTAL_CRAWL = False
+        settings.LISTING_CACHE = False
+        settings.PIPELINE_MODE = "batch"
+    orchestrator = JobAutomationOrchestrator(
+        sources=args.sources,
+        notify=not (args.no_notify or args.dry_run),
+        sync=not (args.no_sync or args.dry_run),
+        dry_run=args.dry_run
+    )
+
+    if args.record or args.replay:
+        ok = orchestrator.run_har_cycle("record" if args.record else "replay")
+        sys.exit(0 if ok else 1)
+
+    if args.worker:
+        try:
+            orchestrator.run_worker(exit_when_idle=args.exit_when_idle)
+        except KeyboardInterrupt:
+            logger.info("Worker stopped by user.")
+        return
+
+    if args.profile:
+        orchestrator.run_profiled_cycle([mode.strip() for mode in args.profile.split(",")])
+        return
 
-    # Option 1: Daily Scheduling (Default: 10:00 AM)
-    # You can change this to match your preference
-    scheduled_time = "10:00"
-    logger.info(f"Scheduling daily automation at {scheduled_time}")
-    schedule.every().day.at(scheduled_time).do(orchestrator.run_cycle)
+    if args.once or args.dry_run:
+        orchestrator.run_cycle()
+        if args.dry_run:
+            print_top_jobs(orchestrator.last_result)
+        return
 
-    # Option 2: Interval Scheduling (Legacy fallback)
-    # interval = settings.SCRAPE_INTERVAL_MINUTES
-    # logger.info(f"Scheduling automation every {interval} minutes.")
-    # schedule.every(interval).minutes.do(orchestrator.run_cycle)
+    # Per-source cadence adapted to each source's yield (see utils/scheduler.py);
+    # sources without saved state are due right away
+    scheduler = AdaptiveScheduler([scraper.name for scraper in orchestrator.scrapers])
+    logger.info(f"Adaptive scheduling from a {settings.SCRAPE_INTERVAL_MINUTES} min base interval")
 
     try:
         while True:
-            schedule.run_pending()
-            time.sleep(1)
+            orchestrator.run_due(scheduler)
+            scheduler.sleep_until_next()
     except KeyboardInterrupt:
         logger.info("Automation stopped by user.")
         sys.exit(0)
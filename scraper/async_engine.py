@@ -0,0 +1,193 @@
+import asyncio
+import copy
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from scraper import har
+from scraper.browser_pool import BrowserPool
+from utils.logger import logger
+from utils.metrics import metrics
+
+# Outcome of an adapted run, copied back from the worker's copy of the scraper
+RUN_STATE = (
+    "last_route_stats", "last_yield", "last_error", "last_duration", "last_raw_count",
+    "_pending_watermarks", "_pending_listing"
+)
+
+class SyncScraperThreads:
+    """
+    Worker threads for sync-only scrapers. Sync Playwright objects are bound
+    to the thread that created them, so each thread owns a BrowserPool and
+    every scraper it runs borrows a context from that pool.
+    """
+
+    def __init__(self, size, max_uses=10):
+        self._tasks = queue.Queue()
+        self._threads = [
+            threading.Thread(target=self._work, args=(max_uses,), name=f"scraper-{i}", daemon=True)
+            for i in range(size)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, scraper, cancel):
+        """Queues `scraper.run`; returns a concurrent Future of its jobs."""
+        future = Future()
+        self._tasks.put((scraper, cancel, future))
+        return future
+
+    def _work(self, max_uses):
+        with BrowserPool(max_uses=max_uses) as pool:
+            while True:
+                task = self._tasks.get()
+                if task is None:
+                    return
+                scraper, cancel, future = task
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    future.set_result(scraper.run(pool, cancel=cancel))
+                except Exception as e:
+                    future.set_exception(e)
+
+    def shutdown(self):
+        """Lets each thread close its pool once its current scraper returns."""
+        for _ in self._threads:
+            self._tasks.put(None)
+
+class AsyncScrapeEngine:
+    """
+    Runs scrapers concurrently on asyncio with a concurrency limit and a hard
+    per-source deadline, so cycle time tracks the slowest source instead of
+    the sum of all of them.
+
+    Scrapers that implement `scrape_async` share one async Chromium (one
+    context each). Sync-only scrapers are adapted by running `run()` on
+    SyncScraperThreads. A thread can't be stopped, so an adapted run works
+    on a copy of the scraper and is cancelled when its budget runs out: it
+    stops at the next page and saves nothing, and its late results never
+    reach the scraper the next cycle uses.
+    """
+
+    def __init__(self, concurrency=3, default_budget=90, browser_max_uses=10):
+        self.concurrency = concurrency
+        self.default_budget = default_budget
+        self.browser_max_uses = browser_max_uses
+
+    async def _run_native(self, scraper, browser, executor):
+        started = time.perf_counter()
+        jobs = []
+        scraper.last_error = None
+        scraper.last_raw_count = 0
+        scraper.raw_keys = []
+        scraper.discard_state()
+        try:
+            jobs = await self._scrape_native(scraper, browser, executor)
+            # Same watermark cut and listing-fingerprint delta that BaseScraper.stream applies
+            batches = scraper.listing_delta(scraper.until_watermark(scraper.count_raw([jobs or []])))
+            jobs = [job for batch in batches for job in batch]
+            return jobs
+        finally:
+            # Adapted scrapers are measured by BaseScraper.stream
+            scraper.last_yield = len(jobs)
+            scraper.last_duration = time.perf_counter() - started
+            metrics.record_span("scrape", scraper.last_duration, source=scraper.name)
+            metrics.inc("jobs_scraped_total", len(jobs), source=scraper.name)
+
+    async def _scrape_native(self, scraper, browser, executor):
+        if scraper.prefers_http:
+            loop = asyncio.get_running_loop()
+            jobs = await loop.run_in_executor(executor, scraper.run_static)
+            if jobs is not None:
+                return jobs
+
+        context = await browser.new_context(**har.context_options(scraper.name))
+        router = scraper.build_router()
+        try:
+            await har.attach_replay_async(context, scraper.name)
+            if router is not None:
+                await router.attach_async(context)
+            page = await context.new_page()
+            scraper.apply_timeouts(page)
+            return await scraper.scrape_async(page)
+        finally:
+            await context.close()
+            if router is not None:
+                scraper.last_route_stats = router.stats()
+                router.log_stats()
+
+    async def _run_adapted(self, scraper, threads):
+        worker = copy.copy(scraper)
+        cancel = threading.Event()
+        try:
+            jobs = await asyncio.wrap_future(threads.submit(worker, cancel))
+        except asyncio.CancelledError:
+            # Budget spent (asyncio.wait_for cancelled us)
+            cancel.set()
+            raise
+        for name in RUN_STATE:
+            setattr(scraper, name, getattr(worker, name))
+        return jobs
+
+    async def _run_one(self, scraper, browser, semaphore, executor, threads, on_result):
+        budget = scraper.time_budget or self.default_budget
+        loop = asyncio.get_running_loop()
+        async with semaphore:
+            logger.info(f"Running scraper: {scraper.name} (budget {budget}s)")
+            if scraper.supports_async:
+                task = self._run_native(scraper, browser, executor)
+            else:
+                task = self._run_adapted(scraper, threads)
+            try:
+                jobs = await asyncio.wait_for(task, timeout=budget)
+            except asyncio.TimeoutError:
+                scraper.last_error = TimeoutError(f"exceeded {budget}s budget")
+                scraper.last_duration = budget
+                metrics.inc("scrape_timeouts_total", source=scraper.name)
+                logger.error(f"Scraper {scraper.name} exceeded its {budget}s time budget. Skipping.")
+                jobs = []
+            except Exception as e:
+                scraper.last_error = e
+                metrics.inc("scrape_errors_total", source=scraper.name)
+                logger.error(f"Error running scraper {scraper.name}: {e}")
+                jobs = []
+            jobs = jobs or []
+            if on_result is not None:
+                # Hand results downstream as soon as this source finishes
+                await loop.run_in_executor(None, on_result, scraper, jobs)
+            return scraper, jobs
+
+    async def run_all(self, scrapers, on_result=None):
+        """
+        Runs all scrapers concurrently and returns (scraper, jobs) pairs.
+        `on_result(scraper, jobs)` is called as each source finishes.
+        """
+        from playwright.async_api import async_playwright
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        # HTTP-first fetches of native scrapers
+        executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="static")
+        adapted = sum(not s.supports_async for s in scrapers)
+        threads = SyncScraperThreads(min(self.concurrency, adapted), self.browser_max_uses) if adapted else None
+        try:
+            async with async_playwright() as p:
+                browser = None
+                if any(s.supports_async for s in scrapers):
+                    browser = await p.chromium.launch(headless=True)
+                try:
+                    return await asyncio.gather(
+                        *(self._run_one(s, browser, semaphore, executor, threads, on_result) for s in scrapers)
+                    )
+                finally:
+                    if browser is not None:
+                        await browser.close()
+        finally:
+            # Don't block the cycle on adapted scrapers that blew their budget
+            executor.shutdown(wait=False, cancel_futures=True)
+            if threads is not None:
+                threads.shutdown()
+
+    def run(self, scrapers, on_result=None):
+        """Sync entry point used by the orchestrator."""
+        return asyncio.run(self.run_all(scrapers, on_result))
@@ -1,26 +1,542 @@
+import json
+import time
 from abc import ABC, abstractmethod
-from playwright.sync_api import sync_playwright
+from config.settings import settings
+from scraper.request_router import ResourceRouter
+from scraper.extraction import EXTRACT_JS, fields_to_spec
+from scraper import har
+from scraper.listing_cache import listing_cache
+from scraper.waits import wait_for_stable_count, scroll_until_no_new
+from utils.urls import canonicalize_url
+from utils.seen_index import seen_index
 from utils.logger import logger
+from utils.metrics import metrics
+
+def iter_batches(result, batch_size=None):
+    """
+    Normalizes scrape() output into lists of at most `batch_size` jobs.
+    Accepts a list, or a generator yielding single jobs or lists of jobs;
+    yielded lists are flushed right away so they reach the pipeline early.
+    """
+    if not result:
+        return
+    if isinstance(result, list):
+        result = [result]
+    buffer = []
+    for item in result:
+        if isinstance(item, list):
+            buffer.extend(item)
+            flush = True
+        else:
+            buffer.append(item)
+            flush = batch_size is not None and len(buffer) >= batch_size
+        if flush:
+            step = batch_size or len(buffer)
+            for i in range(0, len(buffer), step):
+                yield buffer[i:i + step]
+            buffer = []
+    if buffer:
+        yield buffer
 
 class BaseScraper(ABC):
+    # Hard deadline (seconds) for this source in the async engine.
+    # None falls back to SCRAPE_SOURCE_TIMEOUT_SECONDS.
+    time_budget = None
+
+    # Request routing: resource types to drop and domains that must always
+    # load (e.g. JS bundle CDNs for client-rendered sites).
+    blocked_resource_types = ResourceRouter.DEFAULT_BLOCKED_TYPES
+    allowed_domains = ()
+
+    # Declarative extraction: the CSS selector of one job card and a map of
+    # Field objects read from it (see scraper/extraction.py).
+    card_selector = None
+    fields = {}
+
+    # Fetch strategy: "browser" always uses Playwright; "http" first tries a
+    # plain GET of `base_url` parsed with lxml and only falls back to the
+    # browser when the static markup has no job cards.
+    fetch_mode = "browser"
+
+    # Incremental crawl: how many result pages (or infinite-scroll screens)
+    # a full crawl reads. Later runs stop early at the persisted watermark:
+    # listings sorted newest first stop after `watermark_overlap` known
+    # postings in a row, others after a page with nothing new.
+    max_pages = 1
+    newest_first = True
+    watermark_overlap = 3
+    watermark_size = 200
+
+    # Sources whose URL takes a search term; the terms themselves come from
+    # SOURCE_QUERIES, and each one is crawled (and watermarked) separately.
+    supports_query = False
+
     def __init__(self, name):
         self.name = name
+        self.last_route_stats = {}
+        # Outcome of the last run, read by the scheduler and the health tracker
+        self.last_yield = 0
+        self.last_error = None
+        self.last_duration = 0.0
+        # Cards on the listing before the watermark/delta cut (0 = empty page)
+        self.last_raw_count = 0
+        # Keys of those cards, fingerprinted by `listing_delta`
+        self.raw_keys = []
+        # Playwright timeout override set by the circuit breaker (None = defaults)
+        self.navigation_timeout_ms = None
+        # Search term of the current crawl (None = the source's built-in one)
+        self.query = None
+        # Single result page to crawl, for work-queue tasks (None = all pages)
+        self.page_shard = None
+        # HTTP validators of the last static fetch, kept with the listing fingerprint
+        self._validators = {}
+        # Validators of the last work-queue task, sent back to the orchestrator
+        self.last_validators = {}
+        # threading.Event set when the async engine gives up on this run
+        self._cancel = None
+        # Watermarks and listing fingerprint of the last run; only saved by
+        # `commit_state` once the orchestrator has synced the run's jobs
+        self._pending_watermarks = {}
+        self._pending_listing = None
+
+    @property
+    def supports_async(self):
+        """True when the subclass provides a native `scrape_async`."""
+        return self.scrape_async is not None
+
+    @property
+    def cancelled(self):
+        """True once the run was abandoned (time budget spent); no state is saved after that."""
+        return self._cancel is not None and self._cancel.is_set()
+
+    def build_router(self):
+        """Returns the request router for this source, or None if blocking is off."""
+        if not settings.BLOCK_RESOURCES:
+            return None
+        return ResourceRouter(
+            self.name,
+            blocked_types=self.blocked_resource_types,
+            allowed_domains=self.allowed_domains
+        )
+
+    def _extraction_args(self, card_selector, fields):
+        return [card_selector or self.card_selector, fields_to_spec(fields or self.fields)]
+
+    def _log_extraction(self, items, started):
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        logger.info(f"{self.name}: extracted {len(items)} cards in {elapsed_ms:.0f} ms")
+
+    def extract(self, page, card_selector=None, fields=None):
+        """Reads every card on the page in a single page.evaluate round trip."""
+        started = time.perf_counter()
+        items = page.evaluate(EXTRACT_JS, self._extraction_args(card_selector, fields))
+        self._log_extraction(items, started)
+        return items
 
-    def run(self):
-        logger.info(f"Starting scraper: {self.name}")
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
+    async def extract_async(self, page, card_selector=None, fields=None):
+        """Async variant of `extract` for playwright.async_api pages."""
+        started = time.perf_counter()
+        items = await page.evaluate(EXTRACT_JS, self._extraction_args(card_selector, fields))
+        self._log_extraction(items, started)
+        return items
+
+    def run_static(self):
+        """
+        HTTP-first path. Returns parsed jobs, or None when the static response
+        lacks job cards (or fails) and the browser path should be used.
+        """
+        try:
+            logger.info(f"Fetching {self.base_url} over HTTP")
+            # Validators are kept per source, so only the built-in search revalidates
+            revalidate = settings.LISTING_CACHE and self.query is None
+            headers = listing_cache.conditional_headers(self.name) if revalidate else {}
+            response = har.fetch(self.name, self.base_url, timeout=settings.HTTP_TIMEOUT_SECONDS, headers=headers)
+            metrics.inc("http_bytes_total", len(response.content), source=self.name)
+            if response.status_code == 304:
+                metrics.inc("listing_not_modified_total", source=self.name)
+                logger.info(f"{self.name}: listing not modified since last fetch. Nothing to emit.")
+                # Still the cards of the cached listing, not an empty page
+                entry = listing_cache.get(self.name)
+                self.last_raw_count = len(entry["ids"]) if entry else 1
+                return []
+            if revalidate:
+                self._validators = {
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified")
+                }
+            from scraper import http_fetch
+
+            started = time.perf_counter()
+            items = http_fetch.extract_html(response.text, self.card_selector, self.fields)
+            self._log_extraction(items, started)
+            jobs = self.parse_all(items)
+        except Exception as e:
+            logger.warning(f"HTTP fetch failed for {self.name}: {e}")
+            return None
+
+        if not jobs:
+            logger.info(f"{self.name}: no job cards in static HTML, falling back to browser.")
+            return None
+        return jobs
+
+    @property
+    def prefers_http(self):
+        return self.fetch_mode == "http" and settings.HTTP_FIRST
+
+    def parse(self, item):
+        """
+        Turns one extracted card into a JobRecord (or a list of them).
+        Return None to skip the card.
+        """
+        return item
+
+    def parse_all(self, items):
+        """Applies `parse` to every card, skipping cards that fail."""
+        jobs = []
+        for item in items:
             try:
-                data = self.scrape(page)
-                browser.close()
-                return data
+                parsed = self.parse(item)
             except Exception as e:
-                logger.error(f"Error during scraping with {self.name}: {e}")
-                browser.close()
-                return []
+                logger.error("Error parsing a job card in %s: %s", self.name, e,
+                             extra={"rate_limit": True, "source": self.name})
+                continue
+            if parsed is None:
+                continue
+            if isinstance(parsed, list):
+                jobs.extend(parsed)
+            else:
+                jobs.append(parsed)
+        return jobs
+
+    def apply_timeouts(self, page):
+        """Caps the page's Playwright timeouts while the circuit breaker says so."""
+        if self.navigation_timeout_ms is not None:
+            page.set_default_navigation_timeout(self.navigation_timeout_ms)
+            page.set_default_timeout(self.navigation_timeout_ms)
+
+    def _scrape_with_router(self, page, batch_size):
+        self.apply_timeouts(page)
+        # Registered first so the router's pass-through falls back to it
+        har.attach_replay(page, self.name)
+        router = self.build_router()
+        if router is not None:
+            router.attach(page)
+        try:
+            yield from iter_batches(self.scrape(page), batch_size)
+        finally:
+            if router is not None:
+                self.last_route_stats = router.stats()
+                router.log_stats()
+
+    def job_key(self, job):
+        """Stable id of a job card, used for listing fingerprints."""
+        return canonicalize_url(job.link)
+
+    def listing_delta(self, batches, validators=None):
+        """
+        Filters batches down to jobs that were not on this source's listing
+        last time (per the persisted fingerprint cache). An unchanged listing
+        emits nothing; an expired or missing entry emits everything. The
+        fingerprint covers every card the crawl loaded (`raw_keys`, collected
+        by `count_raw` before the watermark cut) and is kept pending (see
+        `commit_state`), with `validators` (default: those of this scraper's
+        last static fetch).
+        """
+        if not settings.LISTING_CACHE:
+            yield from batches
+            return
+
+        entry = listing_cache.get(self.name)
+        known = set(entry["ids"]) if entry else set()
+        emitted = 0
+        for batch in batches:
+            fresh = [job for job in batch if self.job_key(job) not in known]
+            if fresh:
+                emitted += len(fresh)
+                yield fresh
+
+        # An empty listing usually means a failure: keep the last good entry.
+        # An abandoned run's jobs were never emitted, so don't mark them seen.
+        ids = self.raw_keys
+        if not ids or self.cancelled:
+            return
+        fetched, self._validators = self._validators, {}
+        validators = fetched if validators is None else validators
+        if entry and entry["fingerprint"] == listing_cache.fingerprint(ids):
+            logger.info(f"{self.name}: listing unchanged ({len(ids)} cards). Nothing to emit.")
+        elif entry:
+            logger.info(f"{self.name}: listing changed, emitting {emitted} of {len(ids)} cards.")
+        self._pending_listing = (ids, validators)
+
+    @property
+    def search_queries(self):
+        """Search terms to crawl; [None] means just the built-in search."""
+        queries = settings.SOURCE_QUERIES.get(self.name) if self.supports_query else None
+        return list(queries) if queries else [None]
+
+    @property
+    def paged(self):
+        """True when result pages have their own URLs (see `page_url`)."""
+        return type(self).page_url is not BaseScraper.page_url
+
+    def shards(self):
+        """(query, page) pairs this source splits into as work-queue tasks."""
+        pages = range(self.max_pages) if self.paged and settings.WORK_QUEUE_SHARD_PAGES else [None]
+        return [(query, page) for query in self.search_queries for page in pages]
+
+    def page_url(self, page_number):
+        """URL of result page `page_number` (0-based), or None past the last one."""
+        return self.base_url if page_number == 0 else None
+
+    def crawl_pages(self, page, timeout_ms=60000):
+        """
+        Yields the parsed jobs of each result page in turn, up to `max_pages`.
+        Stops at the first page without cards; the consumer stops it earlier
+        by closing the generator (see `until_watermark`).
+        """
+        numbers = range(self.max_pages) if self.page_shard is None else [self.page_shard]
+        for number in numbers:
+            url = self.page_url(number)
+            if url is None:
+                return
+            logger.info(f"Navigating to {url}")
+            page.goto(url, wait_until="domcontentloaded", timeout=self.navigation_timeout_ms or timeout_ms)
+            if not wait_for_stable_count(page, self.card_selector, timeout_ms=15000):
+                logger.info(f"{self.name}: no job cards on page {number + 1}. End of listing.")
+                return
+            jobs = self.parse_all(self.extract(page))
+            if not jobs:
+                return
+            yield jobs
+
+    def crawl_scroll(self, page, settle_ms=1500, scroll=None, card_selector=None):
+        """
+        Infinite-scroll variant of `crawl_pages`: yields the jobs on the first
+        screen, then only the cards each further scroll appends, for up to
+        `max_pages` screens or until a scroll loads nothing new.
+        """
+        card_selector = card_selector or self.card_selector
+        done = 0
+        for screen in range(self.max_pages):
+            if screen and scroll_until_no_new(
+                page, card_selector, max_scrolls=1, settle_ms=settle_ms, scroll=scroll
+            ) <= done:
+                return
+            items = self.extract(page, card_selector=card_selector)
+            # Cards are appended, so everything past `done` is new
+            new_items, done = items[done:], len(items)
+            if not new_items:
+                return
+            yield self.parse_all(new_items)
+
+    def _watermark_key(self):
+        return f"watermark:{self.name}" + (f":{self.query}" if self.query else "")
+
+    def load_watermark(self):
+        """Canonical links of the newest postings seen on earlier runs."""
+        return json.loads(seen_index.get_meta(self._watermark_key(), "[]"))
+
+    def commit_state(self):
+        """
+        Saves the watermarks and listing fingerprint of the last run. Called
+        once its jobs are synced: saved earlier, a failed sync would hide
+        those jobs from every later run.
+        """
+        for key, keys in self._pending_watermarks.items():
+            seen_index.set_meta(key, json.dumps(keys))
+        if self._pending_listing is not None:
+            ids, validators = self._pending_listing
+            listing_cache.store(self.name, ids, **validators)
+        self.discard_state()
+
+    @property
+    def has_pending_state(self):
+        return bool(self._pending_watermarks) or self._pending_listing is not None
+
+    def discard_state(self):
+        """Drops the last run's pending state, so the next run re-reads those jobs."""
+        self._pending_watermarks = {}
+        self._pending_listing = None
+
+    def count_raw(self, batches):
+        """Passes batches through, counting their jobs into `last_raw_count` and `raw_keys`."""
+        try:
+            for batch in batches:
+                # Stop loading pages once the run is abandoned
+                if self.cancelled:
+                    return
+                self.last_raw_count += len(batch)
+                self.raw_keys.extend(self.job_key(job) for job in batch)
+                yield batch
+        finally:
+            close = getattr(batches, "close", None)
+            if close is not None:
+                close()
+
+    def until_watermark(self, batches):
+        """
+        Passes batches through until the crawl reaches postings seen on an
+        earlier run, then closes the producer so no further pages load.
+        Known postings are dropped; new ones become the next watermark
+        (pending until `commit_state`).
+        """
+        if not settings.INCREMENTAL_CRAWL:
+            yield from batches
+            return
+
+        previous = self.load_watermark()
+        known = set(previous)
+        new_keys = []
+        streak = 0
+        pages = 0
+        stopped = False
+        try:
+            for batch in batches:
+                pages += 1
+                fresh = []
+                for job in batch:
+                    key = self.job_key(job)
+                    if key not in known:
+                        streak = 0
+                        fresh.append(job)
+                        if "://" in key:
+                            new_keys.append(key)
+                        continue
+                    streak += 1
+                    # Sorted listings: a run of known postings means the rest is old too
+                    if self.newest_first and streak >= self.watermark_overlap:
+                        stopped = True
+                        break
+                if fresh:
+                    yield fresh
+                if stopped or (known and not fresh and not self.newest_first):
+                    stopped = True
+                    break
+        finally:
+            close = getattr(batches, "close", None)
+            if close is not None:
+                close()
+
+        if stopped:
+            metrics.inc("watermark_stops_total", source=self.name)
+            logger.info(
+                f"{self.name}: reached watermark after {pages} page(s), {len(new_keys)} new postings."
+            )
+        if new_keys and not self.cancelled:
+            keys = new_keys + [key for key in previous if key not in set(new_keys)]
+            self._pending_watermarks[self._watermark_key()] = keys[:self.watermark_size]
+
+    def stream(self, pool=None, batch_size=None, cancel=None):
+        """
+        Runs the scraper and yields lists of JobRecords as soon as they are
+        parsed, at most `batch_size` at a time. When a BrowserPool is given,
+        the scraper borrows an isolated context from the shared browser
+        instead of launching its own. The crawl stops at the source's
+        watermark (see `until_watermark`), and jobs already on the previous
+        listing are skipped (see `listing_delta`). Setting the `cancel`
+        event stops the crawl at the next page without saving any state.
+        """
+        count = 0
+        self._cancel = cancel
+        self.discard_state()
+        self.last_error = None
+        self.last_raw_count = 0
+        self.raw_keys = []
+        started = time.perf_counter()
+        span = None
+        try:
+            with metrics.span("scrape", source=self.name) as span:
+                for batch in self.listing_delta(self._stream_queries(pool, batch_size)):
+                    count += len(batch)
+                    # Time the consumer holds us up (back-pressure) isn't scraping
+                    with span.paused():
+                        yield batch
+        finally:
+            waited = span.paused_seconds if span is not None else 0.0
+            self.query = None
+            self.last_yield = count
+            self.last_duration = time.perf_counter() - started - waited
+            if waited:
+                metrics.record_span("scrape_wait", waited, source=self.name)
+            if not self.cancelled:
+                metrics.inc("jobs_scraped_total", count, source=self.name)
+
+    def _stream_queries(self, pool, batch_size):
+        for query in self.search_queries:
+            if self.cancelled:
+                return
+            self.query = query
+            yield from self.until_watermark(self.count_raw(self._stream_all(pool, batch_size)))
+
+    def run_task(self, pool=None, query=None, page=None, timeout_ms=None):
+        """
+        Runs one work-queue task: a single query (and page, for paged
+        sources) with no watermark cut or listing delta, which the
+        aggregating orchestrator applies. Returns the parsed jobs.
+        """
+        jobs = []
+        self.last_error = None
+        self.last_raw_count = 0
+        self.raw_keys = []
+        self._validators = {}
+        self.query, self.page_shard, self.navigation_timeout_ms = query, page, timeout_ms
+        started = time.perf_counter()
+        try:
+            with metrics.span("scrape", source=self.name):
+                for batch in self.count_raw(self._stream_all(pool, None)):
+                    jobs.extend(batch)
+        finally:
+            self.last_validators, self._validators = self._validators, {}
+            self.query = self.page_shard = self.navigation_timeout_ms = None
+            self.last_duration = time.perf_counter() - started
+        return jobs
+
+    def _stream_all(self, pool, batch_size):
+        logger.info(f"Starting scraper: {self.name}" + (f" (query: {self.query})" if self.query else ""))
+        if self.prefers_http:
+            jobs = self.run_static()
+            if jobs is not None:
+                yield from iter_batches(jobs, batch_size)
+                return
+
+        try:
+            if pool is not None:
+                with pool.page(**har.context_options(self.name)) as page:
+                    yield from self._scrape_with_router(page, batch_size)
+                return
+
+            from playwright.sync_api import sync_playwright
+
+            with sync_playwright() as p:
+                browser = p.chromium.launch(headless=True)
+                # Closing the context (not just the browser) flushes a HAR recording
+                context = browser.new_context(**har.context_options(self.name))
+                try:
+                    yield from self._scrape_with_router(context.new_page(), batch_size)
+                finally:
+                    context.close()
+                    browser.close()
+        except Exception as e:
+            self.last_error = e
+            metrics.inc("scrape_errors_total", source=self.name)
+            logger.error(f"Error during scraping with {self.name}: {e}")
+
+    def run(self, pool=None, cancel=None):
+        """Runs the scraper to completion and returns all jobs."""
+        jobs = []
+        for batch in self.stream(pool, cancel=cancel):
+            jobs.extend(batch)
+        return jobs
 
     @abstractmethod
     def scrape(self, page):
-        """Implement the scraping logic here"""
+        """
+        Implement the scraping logic here. Return a list of JobRecords, or
+        yield jobs / lists of jobs to stream them downstream as they parse.
+        """
         pass
+
+    # Optional `async def scrape_async(self, page)`: the async variant of
+    # `scrape` taking a playwright.async_api page. Scrapers without it run
+    # in the async engine on a thread adapter.
+    scrape_async = None
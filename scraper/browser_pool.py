@@ -0,0 +1,120 @@
+from contextlib import contextmanager
+from utils.logger import logger
+
+def _playwright_error():
+    # Imported on use so that importing the pool doesn't load Playwright
+    from playwright.sync_api import Error
+    return Error
+
+class BrowserPool:
+    """
+    Shares a single headless Chromium across all scrapers in a cycle.
+    Every scraper gets its own isolated BrowserContext (cookies, storage and
+    headers are never shared), while the expensive browser process is started
+    once and recycled after `max_uses` contexts or when it crashes.
+    """
+
+    def __init__(self, max_uses=10, headless=True):
+        self.max_uses = max_uses
+        self.headless = headless
+        self._playwright = None
+        self._browser = None
+        self._uses = 0
+
+        # Pool statistics
+        self.launches = 0
+        self.reuses = 0
+        self.recycles = 0
+        self.crashes = 0
+        self.active_contexts = 0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def start(self):
+        """Starts the Playwright driver (the browser itself is launched lazily)."""
+        if self._playwright is None:
+            from playwright.sync_api import sync_playwright
+
+            self._playwright = sync_playwright().start()
+
+    def _launch(self):
+        self._browser = self._playwright.chromium.launch(headless=self.headless)
+        self._uses = 0
+        self.launches += 1
+        logger.info(f"Browser pool launched Chromium (launch #{self.launches})")
+
+    def _close_browser(self):
+        if self._browser is not None:
+            try:
+                self._browser.close()
+            except _playwright_error():
+                # Browser already gone (crash or disconnect)
+                pass
+            self._browser = None
+
+    def _acquire_browser(self):
+        """Returns a healthy browser, recycling it if it is exhausted or dead."""
+        self.start()
+
+        if self._browser is not None and not self._browser.is_connected():
+            logger.warning("Pooled browser disconnected. Relaunching.")
+            self.crashes += 1
+            self._browser = None
+
+        if self._browser is not None and self._uses >= self.max_uses:
+            logger.info(f"Recycling pooled browser after {self._uses} uses.")
+            self._close_browser()
+            self.recycles += 1
+
+        if self._browser is None:
+            self._launch()
+        else:
+            self.reuses += 1
+
+        self._uses += 1
+        return self._browser
+
+    @contextmanager
+    def page(self, **context_options):
+        """Yields a fresh page inside an isolated context on the pooled browser."""
+        browser = self._acquire_browser()
+        context = browser.new_context(**context_options)
+        self.active_contexts += 1
+        try:
+            yield context.new_page()
+        except _playwright_error():
+            # A crashed browser must not be handed to the next scraper
+            if not browser.is_connected():
+                self.crashes += 1
+                self._browser = None
+            raise
+        finally:
+            self.active_contexts -= 1
+            try:
+                context.close()
+            except _playwright_error():
+                pass
+
+    def stats(self):
+        """Returns pool size and reuse counters."""
+        return {
+            "size": 1 if self._browser is not None else 0,
+            "active_contexts": self.active_contexts,
+            "uses_current_browser": self._uses,
+            "launches": self.launches,
+            "reuses": self.reuses,
+            "recycles": self.recycles,
+            "crashes": self.crashes
+        }
+
+    def close(self):
+        """Closes the pooled browser and stops the Playwright driver."""
+        self._close_browser()
+        if self._playwright is not None:
+            self._playwright.stop()
+            self._playwright = None
@@ -0,0 +1,54 @@
+class Field:
+    """
+    Declares one value to read from a job card.
+
+    selector: CSS selector relative to the card (None = the card itself)
+    attr:     attribute to read (None = trimmed innerText)
+    many:     return a list with one entry per matching element
+    fields:   nested field map, for cards that contain sub-cards
+    """
+
+    def __init__(self, selector=None, attr=None, many=False, fields=None):
+        self.selector = selector
+        self.attr = attr
+        self.many = many
+        self.fields = fields
+
+    def to_spec(self):
+        return {
+            "selector": self.selector,
+            "attr": self.attr,
+            "many": self.many,
+            "fields": fields_to_spec(self.fields) if self.fields else None
+        }
+
+def fields_to_spec(fields):
+    """Serializes a field map into plain dicts for page.evaluate."""
+    return {name: field.to_spec() for name, field in fields.items()}
+
+# Runs inside the page: walks every card once and returns plain JSON, so a
+# whole listing costs a single round trip and leaves no element handles behind.
+EXTRACT_JS = """
+([cardSelector, fields]) => {
+    const read = (el, f) => f.attr ? el.getAttribute(f.attr) : (el.innerText || "").trim();
+    const value = (el, f) => f.fields ? extract(el, f.fields) : read(el, f);
+    const extract = (root, fields) => {
+        const out = {};
+        for (const [name, f] of Object.entries(fields)) {
+            if (f.many) {
+                const els = f.selector ? Array.from(root.querySelectorAll(f.selector)) : [root];
+                out[name] = els.map(el => value(el, f));
+            } else {
+                const el = f.selector ? root.querySelector(f.selector) : root;
+                out[name] = el ? value(el, f) : null;
+            }
+        }
+        return out;
+    };
+    return Array.from(document.querySelectorAll(cardSelector)).map(card => extract(card, fields));
+}
+"""
+
+def value_or(value, default):
+    """Falls back to `default` only when the element was missing (None)."""
+    return default if value is None else value
@@ -0,0 +1,153 @@
+"""
+Record/replay of scraper network traffic as HAR files, one pair per source
+under HAR_DIR: `<source>.har` for browser traffic (written by Playwright)
+and `<source>.http.har` for the HTTP-first fetches. In replay mode every
+request is served from those files through Playwright routing, and
+anything not recorded is aborted, so a replayed scrape never touches the
+network.
+"""
+import base64
+import json
+import os
+import re
+import time
+from datetime import datetime, timezone
+from config.settings import settings
+from utils.logger import logger
+
+# HTTP-first HAR files already truncated by this process (record mode)
+_started_files = set()
+
+class HarMissError(LookupError):
+    """Raised in replay mode when a URL was not recorded."""
+
+def recording():
+    return settings.HAR_MODE == "record"
+
+def replaying():
+    return settings.HAR_MODE == "replay"
+
+def har_path(source, kind="browser"):
+    """HAR file of `source`; `kind` is "browser" or "http"."""
+    slug = re.sub(r"\W+", "_", source.lower()).strip("_")
+    suffix = ".har" if kind == "browser" else ".http.har"
+    return os.path.join(settings.HAR_DIR, slug + suffix)
+
+def context_options(source):
+    """Extra new_context() options: HAR capture when recording."""
+    if not recording():
+        return {}
+    os.makedirs(settings.HAR_DIR, exist_ok=True)
+    return {"record_har_path": har_path(source), "record_har_content": "embed"}
+
+def _abort(route):
+    route.abort()
+
+async def _abort_async(route):
+    await route.abort()
+
+def attach_replay(target, source):
+    """Serves a sync page/context from the source's HAR; unrecorded requests are aborted."""
+    if not replaying():
+        return
+    path = har_path(source)
+    if os.path.exists(path):
+        target.route_from_har(path, not_found="abort")
+    else:
+        logger.warning(f"{source}: no browser recording at {path}. Aborting all requests.")
+        target.route("**/*", _abort)
+
+async def attach_replay_async(target, source):
+    """Async variant of `attach_replay`."""
+    if not replaying():
+        return
+    path = har_path(source)
+    if os.path.exists(path):
+        await target.route_from_har(path, not_found="abort")
+    else:
+        logger.warning(f"{source}: no browser recording at {path}. Aborting all requests.")
+        await target.route("**/*", _abort_async)
+
+def _headers(mapping):
+    return [{"name": name, "value": value} for name, value in mapping.items()]
+
+def _record(path, url, response, elapsed_ms):
+    """
+    Appends one requests.Response to a HAR 1.2 file, under the requested
+    `url` (not `response.url`, which is the target of any redirects) so
+    that `_replay` finds it.
+    """
+    har = {"log": {"version": "1.2", "creator": {"name": "webScrapingForJobs", "version": "1"}, "entries": []}}
+    if path in _started_files and os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            har = json.load(f)
+    _started_files.add(path)
+
+    request = response.request
+    har["log"]["entries"].append({
+        "startedDateTime": datetime.now(timezone.utc).isoformat(),
+        "time": elapsed_ms,
+        "request": {
+            "method": request.method, "url": url, "httpVersion": "HTTP/1.1",
+            "headers": _headers(request.headers), "queryString": [], "cookies": [],
+            "headersSize": -1, "bodySize": 0
+        },
+        "response": {
+            "status": response.status_code, "statusText": response.reason or "", "httpVersion": "HTTP/1.1",
+            "headers": _headers(response.headers), "cookies": [],
+            "content": {
+                "size": len(response.content),
+                "mimeType": response.headers.get("Content-Type", ""),
+                "text": response.text
+            },
+            "redirectURL": response.headers.get("Location", ""), "headersSize": -1,
+            "bodySize": len(response.content)
+        },
+        "cache": {},
+        "timings": {"send": 0, "wait": elapsed_ms, "receive": 0}
+    })
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(har, f)
+
+def _replay(path, url):
+    """Builds a requests.Response from the last HAR entry recorded for `url`."""
+    import requests
+    from requests.structures import CaseInsensitiveDict
+
+    try:
+        with open(path, encoding="utf-8") as f:
+            entries = json.load(f)["log"]["entries"]
+    except FileNotFoundError:
+        raise HarMissError(f"no recording at {path}")
+    for entry in reversed(entries):
+        if entry["request"]["url"] == url:
+            break
+    else:
+        raise HarMissError(f"{url} not recorded in {path}")
+
+    recorded = entry["response"]
+    content = recorded["content"]
+    body = content.get("text", "")
+    response = requests.Response()
+    response._content = base64.b64decode(body) if content.get("encoding") == "base64" else body.encode("utf-8")
+    response.encoding = "utf-8"
+    response.status_code = recorded["status"]
+    response.reason = recorded.get("statusText", "")
+    response.headers = CaseInsensitiveDict({h["name"]: h["value"] for h in recorded["headers"]})
+    response.url = url
+    return response
+
+def fetch(source, url, timeout=15, headers=None):
+    """`http_fetch.fetch` with HAR capture (record) or HAR playback (replay)."""
+    from scraper import http_fetch
+
+    if replaying():
+        response = _replay(har_path(source, "http"), url)
+        response.raise_for_status()
+        return response
+    started = time.perf_counter()
+    response = http_fetch.fetch(url, timeout=timeout, headers=headers)
+    if recording():
+        _record(har_path(source, "http"), url, response, round((time.perf_counter() - started) * 1000, 1))
+    return response
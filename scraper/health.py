@@ -0,0 +1,163 @@
+import json
+import time
+from config.settings import settings
+from utils.logger import logger
+from utils.metrics import metrics
+from utils.seen_index import seen_index
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+def percentile(values, q):
+    """Nearest-rank percentile of a list of numbers (None when empty)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))]
+
+class SourceHealth:
+    """Persisted health record of one source."""
+
+    def __init__(self, name, runs=0, successes=0, latencies=None, failure_streak=0, zero_streak=0,
+                 errors=None, state=CLOSED, opened_at=None, opens=0):
+        self.name = name
+        self.runs = runs
+        self.successes = successes
+        # Most recent run durations (seconds), for percentiles
+        self.latencies = latencies or []
+        self.failure_streak = failure_streak
+        self.zero_streak = zero_streak
+        # Error class -> count
+        self.errors = errors or {}
+        self.state = state
+        self.opened_at = opened_at
+        # Consecutive times the breaker opened; doubles the cooldown
+        self.opens = opens
+
+    def to_json(self):
+        return json.dumps({key: value for key, value in vars(self).items() if key != "name"})
+
+    def summary(self):
+        return {
+            "state": self.state,
+            "runs": self.runs,
+            "success_rate": round(self.successes / self.runs, 3) if self.runs else None,
+            "p50_seconds": percentile(self.latencies, 50),
+            "p90_seconds": percentile(self.latencies, 90),
+            "p99_seconds": percentile(self.latencies, 99),
+            "failure_streak": self.failure_streak,
+            "zero_result_streak": self.zero_streak,
+            "errors": dict(self.errors)
+        }
+
+class HealthTracker:
+    """
+    Health records and a circuit breaker per source. A source whose runs
+    keep failing (errors, timeouts, or empty listings) is first run with
+    tightened timeouts, then skipped (breaker open) for a cooldown, then
+    probed once (half-open): a good probe closes the breaker, a bad one
+    re-opens it with twice the cooldown.
+    """
+
+    def __init__(self, failure_threshold=None, zero_result_threshold=None, cooldown_minutes=None,
+                 tightened_timeout_ms=None, tighten_after=None, window=50):
+        self.failure_threshold = failure_threshold or settings.BREAKER_FAILURE_THRESHOLD
+        self.zero_result_threshold = zero_result_threshold or settings.BREAKER_ZERO_RESULT_THRESHOLD
+        self.cooldown = (cooldown_minutes or settings.BREAKER_COOLDOWN_MINUTES) * 60
+        self.tightened_timeout_ms = tightened_timeout_ms or settings.BREAKER_TIGHTENED_TIMEOUT_MS
+        self.tighten_after = tighten_after or settings.BREAKER_TIGHTEN_AFTER
+        self.window = window
+        self._records = {}
+
+    def get(self, name):
+        if name not in self._records:
+            stored = seen_index.get_meta(f"health:{name}")
+            self._records[name] = SourceHealth(name, **json.loads(stored)) if stored else SourceHealth(name)
+        return self._records[name]
+
+    def _cooldown(self, health):
+        return min(self.cooldown * 2 ** max(health.opens - 1, 0), 24 * 3600)
+
+    def retry_at(self, name):
+        """When an open breaker will allow the next probe."""
+        health = self.get(name)
+        return (health.opened_at or 0) + self._cooldown(health)
+
+    def allow(self, scraper, now=None):
+        """
+        Decides whether `scraper` runs this cycle, and with which timeouts.
+        Sets `scraper.navigation_timeout_ms` (None = Playwright defaults).
+        """
+        now = time.time() if now is None else now
+        health = self.get(scraper.name)
+        if health.state == OPEN:
+            if now < self.retry_at(scraper.name):
+                logger.info(f"Circuit open for {scraper.name}: skipping "
+                            f"(probe in {(self.retry_at(scraper.name) - now) / 60:.0f} min)")
+                metrics.inc("breaker_skips_total", source=scraper.name)
+                return False
+            health.state = HALF_OPEN
+            logger.info(f"Circuit half-open for {scraper.name}: probing with tightened timeouts")
+
+        # One bad run is often a blip; only a streak tightens timeouts
+        degraded = (health.state == HALF_OPEN or health.failure_streak >= self.tighten_after
+                    or health.zero_streak >= self.tighten_after)
+        scraper.navigation_timeout_ms = self.tightened_timeout_ms if degraded else None
+        return True
+
+    def record(self, scraper, now=None):
+        """Folds the scraper's last run (duration, error, raw card count) into its record."""
+        now = time.time() if now is None else now
+        health = self.get(scraper.name)
+        error = scraper.last_error
+        empty = error is None and scraper.last_raw_count == 0
+
+        health.runs += 1
+        health.latencies = (health.latencies + [round(scraper.last_duration, 3)])[-self.window:]
+        if error is not None:
+            health.failure_streak += 1
+            # Failures relayed from queue workers keep the worker-side class
+            error_class = getattr(error, "error_class", type(error).__name__)
+            health.errors[error_class] = health.errors.get(error_class, 0) + 1
+        elif empty:
+            health.zero_streak += 1
+            health.errors["EmptyListing"] = health.errors.get("EmptyListing", 0) + 1
+        else:
+            health.successes += 1
+            health.failure_streak = 0
+            health.zero_streak = 0
+
+        healthy = error is None and not empty
+        if health.state == HALF_OPEN:
+            if healthy:
+                logger.info(f"Circuit closed for {scraper.name}: probe succeeded")
+                health.state, health.opens = CLOSED, 0
+            else:
+                self._open(health, now, "probe failed")
+        elif health.state == CLOSED and (health.failure_streak >= self.failure_threshold
+                                         or health.zero_streak >= self.zero_result_threshold):
+            self._open(health, now, f"{health.failure_streak} failures / {health.zero_streak} empty runs in a row")
+
+        seen_index.set_meta(f"health:{scraper.name}", health.to_json())
+        metrics.set_gauge("source_up", int(health.state == CLOSED), source=scraper.name)
+
+    def _open(self, health, now, reason):
+        health.state = OPEN
+        health.opened_at = now
+        health.opens += 1
+        logger.warning(f"Circuit open for {health.name} ({reason}); "
+                       f"skipping it for {self._cooldown(health) / 60:.0f} min")
+        metrics.inc("breaker_opens_total", source=health.name)
+
+    def report(self, names):
+        """Logs one health line per source."""
+        for name in names:
+            s = self.get(name).summary()
+            if not s["runs"]:
+                continue
+            logger.info(
+                f"Health {name}: {s['state']}, success {s['success_rate']:.0%} of {s['runs']}, "
+                f"p50 {s['p50_seconds']}s p90 {s['p90_seconds']}s, "
+                f"streaks fail={s['failure_streak']} empty={s['zero_result_streak']}, errors {s['errors']}"
+            )
+
+health_tracker = HealthTracker()
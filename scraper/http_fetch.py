@@ -0,0 +1,65 @@
+import re
+import requests
+from requests.adapters import HTTPAdapter
+from lxml import etree, html as lxml_html
+from cssselect import HTMLTranslator
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9"
+}
+
+_session = None
+_translator = HTMLTranslator()
+_compiled = {}
+
+def get_session():
+    """Returns the process-wide pooled HTTP session (keep-alive across sources)."""
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10)
+        _session.mount("https://", adapter)
+        _session.mount("http://", adapter)
+        _session.headers.update(DEFAULT_HEADERS)
+    return _session
+
+def fetch(url, timeout=15, headers=None):
+    """GETs a listing page over the pooled session."""
+    response = get_session().get(url, timeout=timeout, headers=headers)
+    response.raise_for_status()
+    return response
+
+def _select(selector, prefix="descendant::"):
+    # Default scoping matches Element.querySelectorAll: descendants only
+    key = (selector, prefix)
+    if key not in _compiled:
+        _compiled[key] = etree.XPath(_translator.css_to_xpath(selector, prefix=prefix))
+    return _compiled[key]
+
+def _read(el, field):
+    if field.attr:
+        return el.get(field.attr)
+    return re.sub(r"\s+", " ", el.text_content()).strip()
+
+def _value(el, field):
+    return _extract(el, field.fields) if field.fields else _read(el, field)
+
+def _extract(root, fields):
+    out = {}
+    for name, field in fields.items():
+        els = _select(field.selector)(root) if field.selector else [root]
+        if field.many:
+            out[name] = [_value(el, field) for el in els]
+        else:
+            out[name] = _value(els[0], field) if els else None
+    return out
+
+def extract_html(markup, card_selector, fields):
+    """
+    Static-HTML counterpart of the in-page EXTRACT_JS script: returns the
+    same list of dicts for the same card selector and field map.
+    """
+    document = lxml_html.fromstring(markup)
+    return [_extract(card, fields) for card in _select(card_selector, "descendant-or-self::")(document)]
@@ -0,0 +1,74 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from config.settings import settings
+
+class ListingCache:
+    """
+    Per-source fingerprint of the last listing we parsed, persisted to a JSON
+    file so it survives restarts. Stores the HTTP validators (ETag /
+    Last-Modified) when the source sends them, plus the ids of every card and
+    a hash over them. Entries older than `ttl_hours` are ignored, which forces
+    a full re-emit of that source.
+    """
+
+    def __init__(self, path, ttl_hours=6):
+        self.path = path
+        self.ttl_seconds = ttl_hours * 3600
+        self._entries = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._entries is None:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._entries = {}
+        return self._entries
+
+    def _save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f)
+        os.replace(tmp_path, self.path)
+
+    @staticmethod
+    def fingerprint(ids):
+        return hashlib.sha1("\n".join(sorted(ids)).encode("utf-8")).hexdigest()
+
+    def get(self, source):
+        """Returns the cached entry for `source`, or None if missing or expired."""
+        with self._lock:
+            entry = self._load().get(source)
+        if entry is None or time.time() - entry["stored_at"] > self.ttl_seconds:
+            return None
+        return entry
+
+    def conditional_headers(self, source):
+        """If-None-Match / If-Modified-Since headers for a still-valid entry."""
+        entry = self.get(source)
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, source, ids, etag=None, last_modified=None):
+        with self._lock:
+            self._load()[source] = {
+                "fingerprint": self.fingerprint(ids),
+                "ids": sorted(set(ids)),
+                "etag": etag,
+                "last_modified": last_modified,
+                "stored_at": time.time()
+            }
+            self._save()
+
+listing_cache = ListingCache(settings.LISTING_CACHE_PATH, ttl_hours=settings.LISTING_CACHE_TTL_HOURS)
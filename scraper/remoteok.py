@@ -1,58 +1,57 @@
-import time
 from scraper.base_scraper import BaseScraper
+from scraper.extraction import Field
+from scraper.waits import wait_for_stable_count, wait_for_stable_count_async, scroll_until_no_new_async
 from utils.logger import logger
+from utils.records import JobRecord
 
 class RemoteOKScraper(BaseScraper):
+    # Listing markup is rendered server-side
+    fetch_mode = "http"
+    # Newest first; the browser path lazy-loads up to this many screens
+    max_pages = 10
+
+    # RemoteOK jobs are in rows with class 'job'
+    card_selector = "tr.job"
+    fields = {
+        "company": Field(attr="data-company"),
+        "role": Field("h2"),
+        # Tags are usually in a div with class 'tags'
+        "tags": Field(".tag h3", many=True),
+        # Location is often in a div with class 'location'
+        "location": Field(".location"),
+        "apply_path": Field(attr="data-href"),
+        "date": Field(".time time", attr="datetime")
+    }
+
     def __init__(self):
         super().__init__("RemoteOK")
         self.base_url = "https://remoteok.com/remote-internship-jobs"
 
+    def parse(self, item):
+        apply_path = item["apply_path"]
+        return JobRecord(
+            source=self.name,
+            company=item["company"],
+            role=item["role"],
+            location=item["location"],
+            tags=", ".join(item["tags"]),
+            link=f"https://remoteok.com{apply_path}" if apply_path else None,
+            date=item["date"]
+        )
+
     def scrape(self, page):
         logger.info(f"Navigating to {self.base_url}")
-        page.goto(self.base_url, wait_until="networkidle")
-        
-        # Human-like delay
-        time.sleep(2)
-        
-        # RemoteOK often has a popup or requires scrolling
-        page.evaluate("window.scrollTo(0, document.body.scrollHeight/2)")
-        time.sleep(1)
-
-        jobs = []
-        # RemoteOK jobs are in rows with class 'job'
-        job_elements = page.query_selector_all("tr.job")
-        
-        for el in job_elements:
-            try:
-                company = el.get_attribute("data-company")
-                role = el.query_selector("h2").inner_text().strip() if el.query_selector("h2") else "N/A"
-                
-                # Tags are usually in a div with class 'tags'
-                tags = [tag.inner_text().strip() for tag in el.query_selector_all(".tag h3")]
-                
-                # Location is often in a div with class 'location'
-                location_el = el.query_selector(".location")
-                location = location_el.inner_text().strip() if location_el else "Remote"
-                
-                # Apply link
-                apply_path = el.get_attribute("data-href")
-                apply_link = f"https://remoteok.com{apply_path}" if apply_path else "N/A"
-                
-                # Date
-                date_el = el.query_selector(".time time")
-                date = date_el.get_attribute("datetime") if date_el else "N/A"
-
-                jobs.append({
-                    "Company": company,
-                    "Role": role,
-                    "Location": location,
-                    "Tags": ", ".join(tags),
-                    "Apply Link": apply_link,
-                    "Date": date,
-                    "Source": "RemoteOK"
-                })
-            except Exception as e:
-                logger.error(f"Error parsing a job row in RemoteOK: {e}")
-                continue
-
-        return jobs
+        page.goto(self.base_url, wait_until="domcontentloaded")
+        wait_for_stable_count(page, self.card_selector, timeout_ms=10000)
+
+        # RemoteOK lazy-loads more rows on scroll; stream each screen so the
+        # crawl can stop at the watermark
+        yield from self.crawl_scroll(page)
+
+    async def scrape_async(self, page):
+        logger.info(f"Navigating to {self.base_url}")
+        await page.goto(self.base_url, wait_until="domcontentloaded")
+        await wait_for_stable_count_async(page, self.card_selector, timeout_ms=10000)
+        await scroll_until_no_new_async(page, self.card_selector, max_scrolls=self.max_pages - 1)
+
+        return self.parse_all(await self.extract_async(page))
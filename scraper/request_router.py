@@ -0,0 +1,122 @@
+from urllib.parse import urlparse
+from utils.logger import logger
+from utils.metrics import metrics
+
+class ResourceRouter:
+    """
+    Playwright request router that blocks resources the scrapers never read.
+    We only extract text and href/data-* attributes, so images, fonts, media
+    and analytics beacons are dropped before they hit the network. Domains on
+    a scraper's allow-list (e.g. JS bundle CDNs) are never touched.
+    """
+
+    DEFAULT_BLOCKED_TYPES = frozenset({"image", "media", "font", "stylesheet"})
+
+    # Third-party trackers/beacons: stubbed with an empty response so page
+    # scripts waiting on them don't error out or retry.
+    DEFAULT_BLOCKED_DOMAINS = (
+        "google-analytics.com", "googletagmanager.com", "doubleclick.net",
+        "googlesyndication.com", "facebook.net", "facebook.com", "hotjar.com",
+        "segment.com", "segment.io", "sentry.io", "intercom.io", "clarity.ms",
+        "fullstory.com", "mixpanel.com", "amplitude.com", "linkedin.com",
+        "twitter.com", "ads-twitter.com", "bing.com", "quantserve.com"
+    )
+
+    # Rough average payload per resource type, used to estimate bytes saved
+    ESTIMATED_BYTES = {
+        "image": 40_000,
+        "media": 500_000,
+        "font": 35_000,
+        "stylesheet": 25_000,
+        "script": 60_000,
+        "xhr": 2_000,
+        "fetch": 2_000,
+        "ping": 500,
+        "other": 5_000
+    }
+
+    def __init__(self, source, blocked_types=None, blocked_domains=None, allowed_domains=()):
+        self.source = source
+        self.blocked_types = frozenset(self.DEFAULT_BLOCKED_TYPES if blocked_types is None else blocked_types)
+        self.blocked_domains = tuple(self.DEFAULT_BLOCKED_DOMAINS if blocked_domains is None else blocked_domains)
+        self.allowed_domains = tuple(allowed_domains)
+
+        # Savings statistics
+        self.requests_allowed = 0
+        self.requests_blocked = 0
+        self.bytes_saved = 0
+        self.blocked_by_type = {}
+
+    @staticmethod
+    def _matches(host, domains):
+        return any(host == d or host.endswith("." + d) for d in domains)
+
+    def decide(self, url, resource_type):
+        """Returns "stub", "abort" or None (let the request through)."""
+        host = (urlparse(url).hostname or "").lower()
+        if self._matches(host, self.allowed_domains):
+            return None
+        if self._matches(host, self.blocked_domains):
+            return "stub"
+        if resource_type in self.blocked_types:
+            return "abort"
+        return None
+
+    def _record(self, resource_type, action):
+        if action is None:
+            self.requests_allowed += 1
+            return
+        self.requests_blocked += 1
+        self.bytes_saved += self.ESTIMATED_BYTES.get(resource_type, self.ESTIMATED_BYTES["other"])
+        self.blocked_by_type[resource_type] = self.blocked_by_type.get(resource_type, 0) + 1
+
+    def _handle(self, route):
+        request = route.request
+        action = self.decide(request.url, request.resource_type)
+        self._record(request.resource_type, action)
+        if action == "stub":
+            route.fulfill(status=204, body="")
+        elif action == "abort":
+            route.abort()
+        else:
+            # Let earlier handlers (e.g. HAR replay) serve it, else the network
+            route.fallback()
+
+    async def _handle_async(self, route):
+        request = route.request
+        action = self.decide(request.url, request.resource_type)
+        self._record(request.resource_type, action)
+        if action == "stub":
+            await route.fulfill(status=204, body="")
+        elif action == "abort":
+            await route.abort()
+        else:
+            await route.fallback()
+
+    def attach(self, target):
+        """Installs the router on a sync page or context."""
+        target.route("**/*", self._handle)
+        return self
+
+    async def attach_async(self, target):
+        """Installs the router on an async page or context."""
+        await target.route("**/*", self._handle_async)
+        return self
+
+    def stats(self):
+        return {
+            "requests_allowed": self.requests_allowed,
+            "requests_blocked": self.requests_blocked,
+            "bytes_saved_estimate": self.bytes_saved,
+            "blocked_by_type": dict(self.blocked_by_type)
+        }
+
+    def log_stats(self):
+        """Logs this page's savings and adds them to the run metrics."""
+        metrics.inc("browser_requests_total", self.requests_allowed, source=self.source, outcome="allowed")
+        metrics.inc("browser_requests_total", self.requests_blocked, source=self.source, outcome="blocked")
+        metrics.inc("browser_bytes_saved_estimate_total", self.bytes_saved, source=self.source)
+        logger.info(
+            f"{self.source}: blocked {self.requests_blocked} requests "
+            f"(~{self.bytes_saved / 1024:.0f} KiB saved), allowed {self.requests_allowed}"
+        )
@@ -0,0 +1,125 @@
+"""
+Event-driven waits for BaseScraper subclasses. Every wait returns as soon as
+its condition holds and never blocks longer than its timeout; on timeout it
+logs and returns instead of raising, so a slow page degrades to "fewer cards"
+rather than a failed scrape.
+"""
+import time
+import re
+import itertools
+from utils.logger import logger
+
+_wait_ids = itertools.count()
+
+# Truthy (the card count) once the count has been non-zero and unchanged for
+# `stableMs`. State lives on window under a per-call key.
+STABLE_COUNT_JS = """
+([selector, stableMs, key]) => {
+    const n = document.querySelectorAll(selector).length;
+    const now = performance.now();
+    const s = window[key] || (window[key] = {n: -1, t: now});
+    if (n !== s.n) { s.n = n; s.t = now; return false; }
+    return n > 0 && now - s.t >= stableMs ? n : false;
+}
+"""
+
+COUNT_JS = "(selector) => document.querySelectorAll(selector).length"
+GREW_JS = "([selector, previous]) => document.querySelectorAll(selector).length > previous"
+SCROLL_TO_BOTTOM_JS = "window.scrollTo(0, document.body.scrollHeight)"
+
+def _timeout_error():
+    # Imported on use: whoever holds a page has loaded Playwright already
+    from playwright.sync_api import TimeoutError
+    return TimeoutError
+
+def _elapsed_ms(started):
+    return (time.perf_counter() - started) * 1000
+
+def wait_for_stable_count(page, selector, stable_ms=500, timeout_ms=10000, poll_ms=100):
+    """Waits until `selector` matches a non-zero, unchanging number of elements."""
+    started = time.perf_counter()
+    key = f"__waitStable{next(_wait_ids)}"
+    try:
+        handle = page.wait_for_function(
+            STABLE_COUNT_JS, arg=[selector, stable_ms, key], timeout=timeout_ms, polling=poll_ms
+        )
+        count = handle.json_value()
+        handle.dispose()
+        logger.info(f"Wait: {count} x '{selector}' stable after {_elapsed_ms(started):.0f} ms")
+    except _timeout_error():
+        count = page.evaluate(COUNT_JS, selector)
+        logger.warning(f"Wait: '{selector}' not stable within {timeout_ms} ms ({count} found)")
+    return count
+
+async def wait_for_stable_count_async(page, selector, stable_ms=500, timeout_ms=10000, poll_ms=100):
+    """Async variant of `wait_for_stable_count`."""
+    started = time.perf_counter()
+    key = f"__waitStable{next(_wait_ids)}"
+    try:
+        handle = await page.wait_for_function(
+            STABLE_COUNT_JS, arg=[selector, stable_ms, key], timeout=timeout_ms, polling=poll_ms
+        )
+        count = await handle.json_value()
+        await handle.dispose()
+        logger.info(f"Wait: {count} x '{selector}' stable after {_elapsed_ms(started):.0f} ms")
+    except _timeout_error():
+        count = await page.evaluate(COUNT_JS, selector)
+        logger.warning(f"Wait: '{selector}' not stable within {timeout_ms} ms ({count} found)")
+    return count
+
+def scroll_until_no_new(page, selector, max_scrolls=10, settle_ms=1500, timeout_ms=30000, scroll=None):
+    """
+    Scrolls and waits for new `selector` matches after each scroll; stops at
+    the first scroll that yields no new cards. `scroll` overrides the default
+    jump-to-bottom (e.g. a mouse wheel for sites listening to wheel events).
+    """
+    started = time.perf_counter()
+    count = page.evaluate(COUNT_JS, selector)
+    scrolls = 0
+    while scrolls < max_scrolls and _elapsed_ms(started) < timeout_ms:
+        if scroll is not None:
+            scroll()
+        else:
+            page.evaluate(SCROLL_TO_BOTTOM_JS)
+        scrolls += 1
+        try:
+            page.wait_for_function(GREW_JS, arg=[selector, count], timeout=settle_ms, polling=100)
+        except _timeout_error():
+            break
+        count = page.evaluate(COUNT_JS, selector)
+    logger.info(f"Wait: {count} x '{selector}' after {scrolls} scrolls in {_elapsed_ms(started):.0f} ms")
+    return count
+
+async def scroll_until_no_new_async(page, selector, max_scrolls=10, settle_ms=1500, timeout_ms=30000):
+    """Async variant of `scroll_until_no_new` (jump-to-bottom scrolling only)."""
+    started = time.perf_counter()
+    count = await page.evaluate(COUNT_JS, selector)
+    scrolls = 0
+    while scrolls < max_scrolls and _elapsed_ms(started) < timeout_ms:
+        await page.evaluate(SCROLL_TO_BOTTOM_JS)
+        scrolls += 1
+        try:
+            await page.wait_for_function(GREW_JS, arg=[selector, count], timeout=settle_ms, polling=100)
+        except _timeout_error():
+            break
+        count = await page.evaluate(COUNT_JS, selector)
+    logger.info(f"Wait: {count} x '{selector}' after {scrolls} scrolls in {_elapsed_ms(started):.0f} ms")
+    return count
+
+def wait_for_response(page, url_pattern, timeout_ms=15000):
+    """
+    Waits for the next response whose URL matches the regex `url_pattern`
+    (e.g. a site's jobs API call after domcontentloaded). Returns the
+    response, or None on timeout.
+    """
+    started = time.perf_counter()
+    pattern = re.compile(url_pattern)
+    try:
+        response = page.wait_for_event(
+            "response", predicate=lambda r: bool(pattern.search(r.url)), timeout=timeout_ms
+        )
+        logger.info(f"Wait: response /{url_pattern}/ received after {_elapsed_ms(started):.0f} ms")
+        return response
+    except _timeout_error():
+        logger.warning(f"Wait: no response matching /{url_pattern}/ within {timeout_ms} ms")
+        return None
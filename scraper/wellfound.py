@@ -1,14 +1,49 @@
-import time
-import random
 from scraper.base_scraper import BaseScraper
+from scraper.extraction import Field
+from scraper.waits import wait_for_stable_count, scroll_until_no_new
 from utils.logger import logger
+from utils.records import JobRecord
 
 class WellfoundScraper(BaseScraper):
+    # Client-rendered: keep first-party JS bundles and stylesheets (needed
+    # for lazy loading on scroll), only drop heavy media and trackers.
+    blocked_resource_types = {"image", "media", "font"}
+    allowed_domains = ("wellfound.com", "angel.co")
+
+    # Selector for job cards - noted that Wellfound often changes classes
+    # Using a more robust combination of data attributes and structure
+    card_selector = '[data-test="StartupResult"]'
+    fallback_card_selector = ".styles_startupCard__"
+    fields = {
+        "company": Field('[data-test="StartupName"]'),
+        # Job listings within a startup card
+        "listings": Field('[data-test="JobResult"]', many=True, fields={
+            "role": Field('a[data-test="JobTitle"]'),
+            "href": Field('a[data-test="JobTitle"]', attr="href"),
+            # Location and Remote status
+            "location": Field(".styles_jobInfo__ span")
+        })
+    }
+
     def __init__(self):
         super().__init__("Wellfound")
         # Direct URL to remote internship jobs
         self.base_url = "https://www.wellfound.com/role/l/internship/remote"
 
+    def parse(self, item):
+        jobs = []
+        for listing in item["listings"]:
+            apply_path = listing["href"]
+            jobs.append(JobRecord(
+                source=self.name,
+                company=item["company"],
+                role=listing["role"],
+                location=listing["location"],
+                remote="Remote",
+                link=f"https://wellfound.com{apply_path}" if apply_path else None
+            ))
+        return jobs
+
     def scrape(self, page):
         logger.info(f"Navigating to {self.base_url}")
         
@@ -22,59 +57,22 @@ class WellfoundScraper(BaseScraper):
         try:
             page.goto(self.base_url, wait_until="domcontentloaded")
             # Wait for content to load, or handle potential login wall/challenge
-            time.sleep(random.uniform(3, 5))
+            wait_for_stable_count(page, self.card_selector, timeout_ms=10000)
             
             # Scroll to trigger lazy loading
-            for _ in range(3):
-                page.mouse.wheel(0, 800)
-                time.sleep(random.uniform(1, 2))
+            scroll_until_no_new(
+                page, self.card_selector, max_scrolls=3, settle_ms=2000,
+                scroll=lambda: page.mouse.wheel(0, 800)
+            )
 
-            jobs = []
-            # Selector for job cards - noted that Wellfound often changes classes
-            # Using a more robust combination of data attributes and structure
-            job_elements = page.query_selector_all('[data-test="StartupResult"]')
+            items = self.extract(page)
             
-            if not job_elements:
+            if not items:
                 logger.warning("No job elements found on Wellfound. Possible bot block or selector change.")
                 # Fallback selector check
-                job_elements = page.query_selector_all(".styles_startupCard__")
-
-            for el in job_elements:
-                try:
-                    # Extracts info from within the card
-                    company_el = el.query_selector('[data-test="StartupName"]')
-                    company = company_el.inner_text().strip() if company_el else "N/A"
-                    
-                    # Job listings within a startup card
-                    listing_elements = el.query_selector_all('[data-test="JobResult"]')
-                    
-                    for job_el in listing_elements:
-                        role_el = job_el.query_selector('a[data-test="JobTitle"]')
-                        role = role_el.inner_text().strip() if role_el else "N/A"
-                        
-                        apply_path = role_el.get_attribute("href") if role_el else ""
-                        apply_link = f"https://wellfound.com{apply_path}" if apply_path else "N/A"
-                        
-                        # Location and Remote status
-                        info_els = job_el.query_selector_all(".styles_jobInfo__ span")
-                        location = "Remote"
-                        remote_status = "Remote"
-                        if info_els:
-                            location = info_els[0].inner_text().strip()
-                        
-                        jobs.append({
-                            "Company": company,
-                            "Role": role,
-                            "Location": location,
-                            "Remote/On-site": remote_status,
-                            "Apply Link": apply_link,
-                            "Source": "Wellfound"
-                        })
-                except Exception as e:
-                    logger.error(f"Error parsing a Wellfound company card: {e}")
-                    continue
+                items = self.extract(page, card_selector=self.fallback_card_selector)
 
-            return jobs
+            return self.parse_all(items)
         except Exception as e:
             logger.error(f"Critical error on Wellfound: {e}")
             return []
@@ -0,0 +1,234 @@
+"""
+Durable scrape task queue in SQLite. The orchestrator enqueues one task per
+source x search query x result page; any number of worker processes
+(`python main.py --worker`, on this host or on others sharing the queue
+file) claim tasks, run the scraper and store the parsed jobs back. The
+orchestrator then aggregates each source's results and runs the usual
+filter/score/notify/sync stages once.
+"""
+import json
+import os
+import socket
+import sqlite3
+import time
+from utils.logger import logger
+from utils.records import JobRecord
+
+PENDING, RUNNING, DONE, FAILED = "pending", "running", "done", "failed"
+
+class TaskError(Exception):
+    """A task that failed on a worker; keeps the worker-side exception class."""
+
+    def __init__(self, error_class, message):
+        super().__init__(f"{error_class}: {message}")
+        self.error_class = error_class
+
+class ScrapeTask:
+    """One unit of work: a source, optionally narrowed to a query and a page."""
+
+    def __init__(self, id, cycle, source, query=None, page=None, timeout_ms=None, attempts=0):
+        self.id = id
+        self.cycle = cycle
+        self.source = source
+        self.query = query
+        self.page = page
+        self.timeout_ms = timeout_ms
+        self.attempts = attempts
+
+    def __repr__(self):
+        parts = [self.source] + [f"{key}={value}" for key, value in
+                                 (("query", self.query), ("page", self.page)) if value is not None]
+        return f"<ScrapeTask {self.id} {' '.join(parts)}>"
+
+class WorkQueue:
+    """
+    Tasks move pending -> running -> done/failed. A claim is a lease: a task
+    whose worker died is handed out again once the lease runs out, up to
+    `max_attempts` times. Every transition is a short IMMEDIATE transaction,
+    so concurrent workers never claim the same task. A queue file serves
+    one orchestrator (and any number of workers).
+    """
+
+    def __init__(self, path, lease_seconds=300, max_attempts=2):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Autocommit mode; transactions are opened explicitly below
+            self._conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS tasks ("
+                "id INTEGER PRIMARY KEY, cycle TEXT, source TEXT, query TEXT, page INTEGER, "
+                "timeout_ms INTEGER, status TEXT, attempts INTEGER DEFAULT 0, worker TEXT, "
+                "leased_until REAL, result TEXT, error TEXT, error_class TEXT, "
+                "seconds REAL, raw_count INTEGER, validators TEXT, created REAL, finished REAL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, id)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS tasks_cycle ON tasks (cycle)")
+        return self._conn
+
+    def _transaction(self, sql, params=()):
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = conn.execute(sql, params)
+            conn.execute("COMMIT")
+            return result
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def enqueue(self, cycle, tasks):
+        """
+        Adds (source, query, page, timeout_ms) tuples as pending tasks of
+        `cycle`. Unfinished tasks of earlier cycles are given up on: their
+        orchestrator died (or gave up), so nothing would aggregate them.
+        """
+        conn = self._connect()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            stale = conn.execute(
+                "UPDATE tasks SET status = ?, error = 'superseded by a newer cycle', "
+                "error_class = 'Superseded', finished = ? WHERE cycle != ? AND status IN (?, ?)",
+                (FAILED, now, cycle, PENDING, RUNNING)
+            ).rowcount
+            conn.executemany(
+                "INSERT INTO tasks (cycle, source, query, page, timeout_ms, status, created) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(cycle, source, query, page, timeout_ms, PENDING, now)
+                 for source, query, page, timeout_ms in tasks]
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        if stale:
+            logger.warning(f"Dropped {stale} unfinished tasks left by earlier cycles")
+        logger.info(f"Queued {len(tasks)} scrape tasks for cycle {cycle}")
+
+    def claim(self, worker=None):
+        """Leases the oldest runnable task to `worker`; returns a ScrapeTask or None."""
+        worker = worker or f"{socket.gethostname()}:{os.getpid()}"
+        conn = self._connect()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Leases that ran out belong to dead workers; retry or give up on them
+            conn.execute(
+                "UPDATE tasks SET status = ?, error = 'lease expired', error_class = 'LeaseExpired', "
+                "finished = ? WHERE status = ? AND leased_until < ? AND attempts >= ?",
+                (FAILED, now, RUNNING, now, self.max_attempts)
+            )
+            row = conn.execute(
+                "SELECT id, cycle, source, query, page, timeout_ms, attempts FROM tasks "
+                "WHERE status = ? OR (status = ? AND leased_until < ?) ORDER BY id LIMIT 1",
+                (PENDING, RUNNING, now)
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE tasks SET status = ?, worker = ?, leased_until = ?, attempts = attempts + 1 "
+                    "WHERE id = ?",
+                    (RUNNING, worker, now + self.lease_seconds, row[0])
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return ScrapeTask(*row[:6], attempts=row[6] + 1) if row else None
+
+    def complete(self, task, jobs, seconds, raw_count, validators=None):
+        """
+        Stores a task's JobRecords, and the HTTP validators (ETag /
+        Last-Modified) of its listing fetch, and marks it done.
+        """
+        result = json.dumps([job.to_dict() for job in jobs])
+        self._transaction(
+            "UPDATE tasks SET status = ?, result = ?, seconds = ?, raw_count = ?, validators = ?, "
+            "finished = ? WHERE id = ? AND status = ?",
+            (DONE, result, seconds, raw_count, json.dumps(validators or {}), time.time(), task.id, RUNNING)
+        )
+
+    def fail(self, task, error, seconds):
+        """Records a failed run; the task goes back to pending while attempts remain."""
+        status = PENDING if task.attempts < self.max_attempts else FAILED
+        self._transaction(
+            "UPDATE tasks SET status = ?, error = ?, error_class = ?, seconds = ?, finished = ? "
+            "WHERE id = ? AND status = ?",
+            (status, str(error), type(error).__name__, seconds, time.time(), task.id, RUNNING)
+        )
+
+    def cancel(self, cycle):
+        """Gives up on the cycle's unfinished tasks (e.g. past the cycle deadline)."""
+        self._transaction(
+            "UPDATE tasks SET status = ?, error = 'cycle deadline', error_class = 'TimeoutError', "
+            "finished = ? WHERE cycle = ? AND status IN (?, ?)",
+            (FAILED, time.time(), cycle, PENDING, RUNNING)
+        )
+
+    def unfinished(self, cycle):
+        """Sources of `cycle` that still have pending or running tasks."""
+        rows = self._connect().execute(
+            "SELECT DISTINCT source FROM tasks WHERE cycle = ? AND status IN (?, ?)",
+            (cycle, PENDING, RUNNING)
+        )
+        return {source for (source,) in rows}
+
+    def results(self, cycle, source):
+        """Finished tasks of one source, in query/page order, as dicts."""
+        rows = self._connect().execute(
+            "SELECT query, page, status, result, error, error_class, seconds, raw_count, validators FROM tasks "
+            "WHERE cycle = ? AND source = ? ORDER BY id", (cycle, source)
+        )
+        return [
+            {
+                "query": query, "page": page, "status": status,
+                "jobs": [JobRecord.from_dict(row) for row in json.loads(result)] if result else [],
+                "error": TaskError(error_class, error) if status == FAILED else None,
+                "seconds": seconds or 0.0, "raw_count": raw_count or 0,
+                "validators": json.loads(validators) if validators else {}
+            }
+            for query, page, status, result, error, error_class, seconds, raw_count, validators in rows
+        ]
+
+    def purge(self, older_than_hours=24):
+        """Drops tasks (and their stored results) older than the cutoff, whatever their status."""
+        cutoff = time.time() - older_than_hours * 3600
+        self._transaction("DELETE FROM tasks WHERE created < ?", (cutoff,))
+
+def run_worker(scrapers, work_queue, pool, exit_when_idle=None, poll_seconds=1.0):
+    """
+    Claims and runs tasks until interrupted, or until the queue has been
+    empty for `exit_when_idle` seconds. `scrapers` maps source names to
+    scraper instances.
+    """
+    idle_since = time.monotonic()
+    with pool:
+        while True:
+            task = work_queue.claim()
+            if task is None:
+                if exit_when_idle is not None and time.monotonic() - idle_since >= exit_when_idle:
+                    logger.info("Work queue idle. Worker exiting.")
+                    return
+                time.sleep(poll_seconds)
+                continue
+
+            scraper = scrapers.get(task.source)
+            if scraper is None:
+                work_queue.fail(task, LookupError(f"unknown source {task.source!r}"), 0.0)
+                continue
+            logger.info(f"Worker running {task}")
+            jobs = scraper.run_task(pool, query=task.query, page=task.page, timeout_ms=task.timeout_ms)
+            if scraper.last_error is not None:
+                work_queue.fail(task, scraper.last_error, scraper.last_duration)
+            else:
+                work_queue.complete(task, jobs, scraper.last_duration, scraper.last_raw_count,
+                                    validators=scraper.last_validators)
+            idle_since = time.monotonic()
@@ -1,63 +1,62 @@
-import time
-import random
 from scraper.base_scraper import BaseScraper
+from scraper.extraction import Field, value_or
+from scraper.waits import wait_for_stable_count
 from utils.logger import logger
+from utils.records import JobRecord
 
 class YCJobsScraper(BaseScraper):
+    # Client-rendered: keep first-party JS bundles and stylesheets (needed
+    # for lazy loading on scroll), only drop heavy media and trackers.
+    blocked_resource_types = {"image", "media", "font"}
+    allowed_domains = ("workatastartup.com", "ycombinator.com")
+
+    # Not sorted by date: stop after a screen with nothing new
+    max_pages = 15
+    newest_first = False
+
+    # Selector for job items
+    card_selector = ".job-listing"
+    # Fallback for updated UI
+    fallback_card_selector = ".styles_jobCard__"
+    fields = {
+        "company": Field(".company-name"),
+        "role": Field(".job-name a"),
+        "href": Field(".job-name a", attr="href"),
+        "location": Field(".job-location")
+    }
+
     def __init__(self):
         super().__init__("YC Jobs")
         self.base_url = "https://www.workatastartup.com/jobs?job_type=internship"
 
+    def parse(self, item):
+        apply_path = item["href"] or ""
+        apply_link = apply_path if apply_path.startswith("http") else f"https://www.workatastartup.com{apply_path}"
+
+        location_text = value_or(item["location"], "Remote")
+        is_remote = "Remote" if "Remote" in location_text else "On-site/Hybrid"
+
+        return JobRecord(
+            source=self.name,
+            company=item["company"],
+            role=item["role"],
+            location=location_text,
+            remote=is_remote,
+            link=apply_link
+        )
+
     def scrape(self, page):
         logger.info(f"Navigating to {self.base_url}")
         
         # YC uses dynamic content heavily
         try:
-            page.goto(self.base_url, wait_until="networkidle")
-            time.sleep(random.uniform(2, 4))
-            
-            # Scroll to load more jobs
-            for _ in range(5):
-                page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                time.sleep(random.uniform(1, 2))
-
-            jobs = []
-            # Selector for job items
-            job_elements = page.query_selector_all(".job-listing")
-            
-            if not job_elements:
-                # Fallback for updated UI
-                job_elements = page.query_selector_all(".styles_jobCard__")
-
-            for el in job_elements:
-                try:
-                    company_el = el.query_selector(".company-name")
-                    company = company_el.inner_text().strip() if company_el else "N/A"
-                    
-                    role_el = el.query_selector(".job-name a")
-                    role = role_el.inner_text().strip() if role_el else "N/A"
-                    
-                    apply_path = role_el.get_attribute("href") if role_el else ""
-                    apply_link = apply_path if apply_path.startswith("http") else f"https://www.workatastartup.com{apply_path}"
-                    
-                    location_el = el.query_selector(".job-location")
-                    location_text = location_el.inner_text().strip() if location_el else "Remote"
-                    
-                    is_remote = "Remote" if "Remote" in location_text else "On-site/Hybrid"
-
-                    jobs.append({
-                        "Company": company,
-                        "Role": role,
-                        "Location": location_text,
-                        "Remote/On-site": is_remote,
-                        "Apply Link": apply_link,
-                        "Source": "YC Jobs"
-                    })
-                except Exception as e:
-                    logger.error(f"Error parsing a YC job listing: {e}")
-                    continue
-
-            return jobs
+            page.goto(self.base_url, wait_until="domcontentloaded")
+            wait_for_stable_count(page, self.card_selector, timeout_ms=15000)
+
+            # Stream the first screen of jobs, then each screen loaded by scrolling
+            card_selector = self.card_selector
+            if not page.query_selector(card_selector):
+                card_selector = self.fallback_card_selector
+            yield from self.crawl_scroll(page, settle_ms=2000, card_selector=card_selector)
         except Exception as e:
             logger.error(f"Critical error on YC Jobs: {e}")
-            return []
@@ -0,0 +1,256 @@
+import re
+import time
+import zlib
+import numpy as np
+from config.settings import settings
+from utils.logger import logger
+from utils.records import JobRecord
+from utils.seen_index import seen_index
+# Re-exported: canonical links are part of the dedup key
+from utils.urls import canonicalize_url
+
+COMPANY_SUFFIXES = re.compile(
+    r"\b(inc|llc|ltd|limited|corp|corporation|co|gmbh|plc|pvt|private|technologies|labs|hq)\b\.?"
+)
+
+def normalize_company(name):
+    """Lowercases, strips punctuation and legal suffixes ("Acme, Inc." -> "acme")."""
+    text = re.sub(r"[^\w\s]", " ", str(name or "").lower())
+    text = COMPANY_SUFFIXES.sub(" ", text)
+    return " ".join(text.split())
+
+# Missing-company placeholders ("N/A" -> "n a"): they say nothing about
+# the employer, so such postings are only matched by link
+PLACEHOLDER_COMPANIES = {"", normalize_company(JobRecord.DEFAULTS["company"])}
+
+def normalize_role(title):
+    """Lowercases, strips punctuation and bracketed noise from a job title."""
+    text = re.sub(r"\([^)]*\)|\[[^\]]*\]", " ", str(title or "").lower())
+    text = re.sub(r"[^\w\s]", " ", text)
+    return " ".join(text.split())
+
+def _shingles(text, k=3):
+    """Character k-grams of a normalized string."""
+    text = f" {text} "
+    if len(text) <= k:
+        return {text}
+    return {text[i:i + k] for i in range(len(text) - k + 1)}
+
+def jaccard(a, b):
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+class MinHashLSH:
+    """
+    MinHash signatures with banded locality-sensitive hashing. Only items
+    in the same block (e.g. company) sharing at least one band bucket are
+    compared, so near-duplicate search is sub-quadratic in the size of the
+    job history.
+    """
+
+    # Mersenne prime small enough that a * h + b never overflows uint64
+    _PRIME = np.uint64((1 << 31) - 1)
+
+    def __init__(self, num_perm=64, bands=16, seed=1):
+        assert num_perm % bands == 0, "num_perm must be divisible by bands"
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        # Deterministic (a, b) pairs for the universal hash family
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, int(self._PRIME), size=num_perm).astype(np.uint64)[:, None]
+        self._b = rng.randint(0, int(self._PRIME), size=num_perm).astype(np.uint64)[:, None]
+        self._buckets = [{} for _ in range(bands)]
+
+    def signature(self, shingles):
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles)
+        ) % self._PRIME
+        # One row per permutation, minimum over all shingles
+        return tuple(((self._a * hashes + self._b) % self._PRIME).min(axis=1).tolist())
+
+    def _band_keys(self, signature, block):
+        for band in range(self.bands):
+            yield band, (block, signature[band * self.rows:(band + 1) * self.rows])
+
+    def candidates(self, signature, block=None):
+        """Returns ids of items in `block` sharing at least one band with `signature`."""
+        found = set()
+        for band, key in self._band_keys(signature, block):
+            found.update(self._buckets[band].get(key, ()))
+        return found
+
+    def insert(self, item_id, signature, block=None):
+        for band, key in self._band_keys(signature, block):
+            self._buckets[band].setdefault(key, []).append(item_id)
+
+class DedupSession:
+    """
+    Postings of one run: a batch cycle, or every micro-batch of a streaming
+    cycle. Duplicates within the run keep their first posting.
+    """
+
+    def __init__(self):
+        self.lsh = None  # created by the deduplicator on first use
+        self.items = []  # (shingles, cluster_id)
+        self.links = {}
+        self.emitted = set()
+
+class JobDeduplicator:
+    """
+    Cross-source duplicate detection. Two postings are the same job when
+    their canonical apply links match, or when they are from the same
+    (normalized) company and their titles are near-duplicates (Jaccard over
+    character shingles >= `threshold`, candidates found via MinHash/LSH).
+
+    Postings are matched within their run (a DedupSession) and against the
+    job history: the newest `history_size` jobs synced to the tracker, read
+    from the seen-jobs index. A posting matching the history is a repost of
+    a job already synced and is dropped. Jobs that never reached the
+    tracker are not history, so a run that failed to sync retries them.
+    """
+
+    # Cluster id of postings that duplicate an already-synced job
+    SEEN = -1
+
+    def __init__(self, threshold=0.8, num_perm=64, bands=16, history_size=50000):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.history_size = history_size
+        self.reset()
+
+    def reset(self):
+        """Forgets the loaded job history and the title cache."""
+        self.lsh = MinHashLSH(num_perm=self.num_perm, bands=self.bands)
+        self._links = set()
+        self._items = []  # (shingles, SEEN)
+        # Last seen-index row folded into the history
+        self._history_rowid = 0
+        self._history_rows = 0
+        # Titles repeat a lot across sources and cycles; cache their MinHash
+        self._title_cache = {}
+        self.last_stats = {}
+
+    def _title_signature(self, role):
+        title = normalize_role(role)
+        cached = self._title_cache.get(title)
+        if cached is None:
+            if len(self._title_cache) >= 100_000:
+                self._title_cache.clear()
+            shingles = _shingles(title)
+            cached = self._title_cache[title] = (shingles, self.lsh.signature(shingles))
+        return cached
+
+    def _refresh_history(self):
+        """Folds jobs synced since the last call into the history, keeping it bounded."""
+        if self._history_rows > 2 * self.history_size:
+            # Start over from the newest `history_size` rows
+            self.reset()
+        rows = seen_index.recent(after_rowid=self._history_rowid, limit=self.history_size)
+        self._history_rows += len(rows)
+        for rowid, link, company, role in rows:
+            self._history_rowid = rowid
+            if "://" in link:
+                self._links.add(link)
+            company_key = normalize_company(company)
+            if company_key not in PLACEHOLDER_COMPANIES:
+                shingles, signature = self._title_signature(role)
+                self.lsh.insert(len(self._items), signature, block=company_key)
+                self._items.append((shingles, self.SEEN))
+
+    def _match(self, lsh, items, shingles, signature, block):
+        """Cluster of the first near-duplicate title in `block`, or None."""
+        for candidate in lsh.candidates(signature, block=block):
+            cand_shingles, cand_cluster = items[candidate]
+            self._comparisons += 1
+            if jaccard(shingles, cand_shingles) >= self.threshold:
+                return cand_cluster
+        return None
+
+    def cluster_ids(self, companies, roles, links, session=None):
+        """
+        Assigns a cluster id to every posting; postings sharing an id are
+        duplicates, and postings of an already-synced job get SEEN. Earlier
+        postings of the session keep their ids.
+        """
+        session = session if session is not None else DedupSession()
+        if session.lsh is None:
+            session.lsh = MinHashLSH(num_perm=self.num_perm, bands=self.bands)
+        started = time.perf_counter()
+        self._refresh_history()
+        self._comparisons = 0
+        ids = []
+        for company, role, link in zip(companies, roles, links):
+            key = canonicalize_url(link)
+            # Placeholder links ("N/A") never identify a job
+            has_link = "://" in key
+            if has_link and key in self._links:
+                ids.append(self.SEEN)
+                continue
+            cluster = session.links.get(key) if has_link else None
+            if cluster is not None:
+                # Same canonical link as a posting of this run: nothing new to index
+                ids.append(cluster)
+                continue
+
+            company_key = normalize_company(company)
+            fuzzy = company_key not in PLACEHOLDER_COMPANIES
+            shingles, signature = self._title_signature(role)
+            # Near-duplicate titles only count within the same (known) company
+            if fuzzy:
+                if self._match(self.lsh, self._items, shingles, signature, company_key) is not None:
+                    ids.append(self.SEEN)
+                    continue
+                cluster = self._match(session.lsh, session.items, shingles, signature, company_key)
+
+            item_id = len(session.items)
+            if cluster is None:
+                cluster = item_id
+            session.items.append((shingles, cluster))
+            if fuzzy:
+                session.lsh.insert(item_id, signature, block=company_key)
+            if has_link:
+                session.links[key] = cluster
+            ids.append(cluster)
+
+        self.last_stats = {
+            "postings": len(ids),
+            "clusters": len(set(ids) - {self.SEEN}),
+            "history_matches": ids.count(self.SEEN),
+            "comparisons": self._comparisons,
+            "seconds": round(time.perf_counter() - started, 4)
+        }
+        return ids
+
+    def deduplicate(self, df, session=None):
+        """
+        Keeps the first posting of every duplicate cluster in `df` and drops
+        reposts of already-synced jobs. Pass the same DedupSession to carry
+        clusters across calls of one run (e.g. streaming batches).
+        """
+        if df.empty:
+            return df
+        session = session if session is not None else DedupSession()
+        blank = [""] * len(df)
+        ids = self.cluster_ids(
+            df.get('Company', blank), df.get('Role', blank), df.get('Apply Link', blank), session
+        )
+
+        keep = []
+        for cluster in ids:
+            keep.append(cluster != self.SEEN and cluster not in session.emitted)
+            session.emitted.add(cluster)
+
+        stats = self.last_stats
+        logger.info(
+            f"Dedup: {stats['postings']} postings -> {stats['clusters']} clusters, "
+            f"{stats['history_matches']} already synced "
+            f"({stats['comparisons']} candidate comparisons, {stats['seconds'] * 1000:.0f} ms)"
+        )
+        return df[keep]
+
+job_deduplicator = JobDeduplicator(
+    threshold=settings.DEDUP_TITLE_THRESHOLD, history_size=settings.DEDUP_HISTORY_SIZE
+)
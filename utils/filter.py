@@ -1,14 +1,45 @@
 import re
+import numpy as np
 import pandas as pd
+from config.settings import settings
 from utils.logger import logger
+from utils.records import JobRecord, to_frame
+
+def map_distinct(series, fn, missing):
+    """
+    Applies `fn` once per distinct value of `series` and broadcasts the
+    results back with a numpy take. Job dumps repeat the same roles, tags and
+    locations over and over, so this touches Python only per unique string.
+    """
+    codes, uniques = pd.factorize(series)
+    # Missing values get code -1, which indexes the trailing `missing` slot
+    results = np.array([fn(value) for value in uniques] + [missing], dtype=object)
+    return pd.Series(results.take(codes), index=series.index)
 
 class JobFilter:
-    def __init__(self):
+    def __init__(self, match_fields=None, word_boundary=None):
         # Specific keywords for target roles
         self.keywords = ["ui", "ux", "product", "frontend"]
         # Explicit exclusion keywords to avoid irrelevant roles
         self.exclude_keywords = ["game", "gaming", "unity", "unreal"]
-        
+
+        # Columns searched for keywords (e.g. Role and Tags)
+        self.match_fields = match_fields or settings.FILTER_MATCH_FIELDS
+        # Match whole words only ("ui" no longer matches "build")
+        self.word_boundary = settings.FILTER_WORD_BOUNDARY if word_boundary is None else word_boundary
+
+        # Compiled once, then applied column-wide
+        self.include_pattern = self._compile(self.keywords)
+        self.exclude_pattern = self._compile(self.exclude_keywords)
+
+    def _compile(self, keywords):
+        """Builds one case-insensitive alternation regex for a keyword list."""
+        # Longest first so overlapping keywords prefer the fuller match
+        alternation = "|".join(re.escape(kw) for kw in sorted(keywords, key=len, reverse=True))
+        if self.word_boundary:
+            alternation = rf"\b(?:{alternation})\b"
+        return re.compile(alternation, re.IGNORECASE)
+
     def clean_text(self, text):
         """Removes extra whitespace and special characters from text."""
         if not text or not isinstance(text, str):
@@ -21,18 +52,27 @@ class JobFilter:
         """Checks if the role title is relevant and not explicitly excluded."""
         if not role_title:
             return False
-        
-        role_title_lower = role_title.lower()
-        
+
         # 1. Check for exclusion keywords (like Game Design)
-        if any(ex in role_title_lower for ex in self.exclude_keywords):
+        if self.exclude_pattern.search(role_title):
             return False
 
         # 2. Check for inclusion keywords
-        for kw in self.keywords:
-            if kw in role_title_lower:
-                return True
-        return False
+        return bool(self.include_pattern.search(role_title))
+
+    def relevance_mask(self, df):
+        """Vectorized `is_relevant` over all match fields of a DataFrame."""
+        fields = [f for f in self.match_fields if f in df.columns]
+        def hits(pattern, column):
+            found = map_distinct(df[column], lambda v: bool(pattern.search(str(v))), False)
+            return found.to_numpy(dtype=bool)
+
+        included = np.zeros(len(df), dtype=bool)
+        excluded = np.zeros(len(df), dtype=bool)
+        for field in fields:
+            included |= hits(self.include_pattern, field)
+            excluded |= hits(self.exclude_pattern, field)
+        return pd.Series(included & ~excluded, index=df.index)
 
     def normalize_fields(self, df):
         """Normalizes column names and cleans text fields."""
@@ -44,30 +84,32 @@ class JobFilter:
             "Link": "Apply Link"
         }
         df = df.rename(columns=column_mapping)
-        
-        # Clean all string columns
-        for col in df.select_dtypes(include=['object']).columns:
-            df[col] = df[col].apply(self.clean_text)
-            
+
+        # Clean all string columns (once per distinct value)
+        for col in df.select_dtypes(include=['object', 'string']).columns:
+            df[col] = map_distinct(df[col], self.clean_text, "").astype(df[col].dtype)
+
         return df
 
     def filter_jobs(self, all_jobs_list):
         """
-        Takes a list of job dicts, filters them, normalizes them, 
-        and returns a cleaned DataFrame.
+        Takes a list of JobRecords (or job dicts, or a DataFrame), filters
+        them, normalizes them, and returns a cleaned DataFrame.
         """
-        if not all_jobs_list:
+        if all_jobs_list is None or len(all_jobs_list) == 0:
             return pd.DataFrame()
 
-        df = pd.DataFrame(all_jobs_list)
-        
-        # 1. Normalize fields first to have consistent 'Role' column
-        df = self.normalize_fields(df)
-        
-        # 2. Filter based on keywords in 'Role'
+        if isinstance(all_jobs_list, list) and all(isinstance(job, JobRecord) for job in all_jobs_list):
+            # Records are already cleaned and use the canonical columns
+            df = to_frame(all_jobs_list)
+        else:
+            # 1. Normalize fields first to have consistent 'Role' column
+            df = self.normalize_fields(pd.DataFrame(all_jobs_list))
+
+        # 2. Filter based on keywords in 'Role' (and any other match fields)
         if 'Role' in df.columns:
             initial_count = len(df)
-            df = df[df['Role'].apply(self.is_relevant)]
+            df = df[self.relevance_mask(df)]
             filtered_count = initial_count - len(df)
             logger.info(f"Filtered out {filtered_count} irrelevant roles. remaining: {len(df)}")
         else:
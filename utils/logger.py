@@ -1,24 +1,150 @@
+import atexit
+import contextvars
+import json
 import logging
+import queue
 import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
 from config.settings import settings
 
+# Stage/source of the code currently running (set by utils/metrics spans)
+_log_context = contextvars.ContextVar("log_context", default={})
+
+@contextmanager
+def log_context(**fields):
+    """Tags every record logged inside the block with `fields` (e.g. stage, source)."""
+    token = _log_context.set({**_log_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+class ContextFilter(logging.Filter):
+    """Copies the current log context onto the record; runs on the calling thread."""
+
+    def filter(self, record):
+        for key, value in _log_context.get().items():
+            if not hasattr(record, key):
+                setattr(record, key, value)
+        return True
+
+class RateLimitFilter(logging.Filter):
+    """
+    Lets at most `burst` records per source and message template through
+    every `window` seconds, so per-row failures ("Error parsing a job card
+    in %s: %s") can't flood the log. Only records logged with
+    `extra={"rate_limit": True}` are limited; everything else always gets
+    through. Log those with %-style args, so the varying parts (e.g. the
+    exception text) stay out of the key. The next line let through
+    reports how many were suppressed.
+    """
+
+    def __init__(self, burst=5, window=60, max_keys=1000):
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        self.max_keys = max_keys
+        self._sites = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if not getattr(record, "rate_limit", False) or self.burst <= 0:
+            return True
+        site = (getattr(record, "source", None), str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            if site not in self._sites and len(self._sites) >= self.max_keys:
+                self._evict(now)
+            started, count, suppressed = self._sites.get(site, (now, 0, 0))
+            if now - started >= self.window:
+                started, count = now, 0
+            if count >= self.burst:
+                self._sites[site] = (started, count, suppressed + 1)
+                return False
+            self._sites[site] = (started, count + 1, 0)
+        if suppressed:
+            record.msg = f"{record.msg} (suppressed {suppressed} similar messages)"
+        return True
+
+    def _evict(self, now):
+        """Drops keys whose window is over, or else the oldest key."""
+        expired = [site for site, (started, _, _) in self._sites.items() if now - started >= self.window]
+        for site in expired:
+            del self._sites[site]
+        if not expired:
+            del self._sites[next(iter(self._sites))]
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per line, with source/stage when they are known."""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "source": getattr(record, "source", None),
+            "stage": getattr(record, "stage", None)
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+def _file_handler():
+    if settings.LOG_ROTATION == "time":
+        return TimedRotatingFileHandler(
+            settings.LOG_FILE, when=settings.LOG_ROTATE_WHEN,
+            backupCount=settings.LOG_BACKUP_COUNT, encoding="utf-8"
+        )
+    return RotatingFileHandler(
+        settings.LOG_FILE, maxBytes=settings.LOG_MAX_BYTES,
+        backupCount=settings.LOG_BACKUP_COUNT, encoding="utf-8"
+    )
+
 def setup_logger(name):
+    """
+    Returns the named logger, configured once. Records are handed to a
+    QueueHandler and written to the console and the rotating log file by a
+    background QueueListener, so logging never blocks on I/O. Calling it
+    again for the same name is a no-op.
+    """
     logger = logging.getLogger(name)
+    if any(isinstance(h, QueueHandler) for h in logger.handlers):
+        return logger
     logger.setLevel(settings.LOG_LEVEL)
+    # Our handlers are complete; don't also emit through the root logger
+    logger.propagate = False
 
-    formatter = logging.Formatter(
+    text_formatter = logging.Formatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
 
     # Console Handler
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    console_handler.setFormatter(text_formatter)
+
+    # Rotating File Handler
+    file_handler = _file_handler()
+    file_handler.setFormatter(JsonLinesFormatter() if settings.LOG_FORMAT == "json" else text_formatter)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    # Filters run on the calling thread, where the stage/source context lives
+    queue_handler.addFilter(ContextFilter())
+    queue_handler.addFilter(RateLimitFilter(burst=settings.LOG_RATE_LIMIT_BURST,
+                                            window=settings.LOG_RATE_LIMIT_SECONDS))
+    logger.addHandler(queue_handler)
 
-    # File Handler
-    file_handler = logging.FileHandler("app.log")
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+    listener.start()
+    # Flush whatever is still queued on interpreter exit
+    atexit.register(listener.stop)
 
     return logger
 
@@ -0,0 +1,196 @@
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from config.settings import settings
+from utils.logger import logger, log_context
+
+# Upper bounds (seconds) of the duration histogram buckets
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+def _label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items() if v is not None))
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+class Histogram:
+    def __init__(self, buckets=DURATION_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+class SpanTimer:
+    """Handle of an open span; time spent in `paused()` is left out of it."""
+
+    def __init__(self):
+        self.paused_seconds = 0.0
+
+    @contextmanager
+    def paused(self):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.paused_seconds += time.perf_counter() - started
+
+class Metrics:
+    """
+    In-process instrumentation: timing spans, counters and histograms keyed
+    by metric name and labels (stage, source, ...). Values accumulate over
+    the process lifetime for the Prometheus textfile (so counters behave
+    like counters); spans and counters of the current cycle also go into a
+    JSON run summary.
+    """
+
+    def __init__(self, prefix="job_automation"):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._gauges = {}
+        self._run_counters = {}
+        self._run_spans = []
+        self._run_started = time.time()
+        # Set by utils/profiling.CycleProfiler to profile each span
+        self.scope_hook = None
+
+    def begin_run(self):
+        """Starts a new run summary (cumulative values are kept)."""
+        with self._lock:
+            self._run_counters = {}
+            self._run_spans = []
+            self._run_started = time.time()
+
+    def inc(self, name, value=1, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+            self._run_counters[key] = self._run_counters.get(key, 0) + value
+
+    def set_gauge(self, name, value, **labels):
+        with self._lock:
+            self._gauges[(name, _label_key(labels))] = value
+
+    def observe(self, name, value, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def record_span(self, stage, seconds, **labels):
+        """Records a finished span as a duration histogram sample and a summary entry."""
+        self.observe("stage_duration_seconds", seconds, stage=stage, **labels)
+        with self._lock:
+            self._run_spans.append({"stage": stage, **labels, "seconds": round(seconds, 4)})
+
+    @contextmanager
+    def span(self, stage, **labels):
+        """
+        Times the enclosed block as `stage`, minus the time spent in the
+        yielded SpanTimer's `paused()`; failures are counted as errors.
+        """
+        started = time.perf_counter()
+        timer = SpanTimer()
+        try:
+            with log_context(stage=stage, **labels):
+                if self.scope_hook is None:
+                    yield timer
+                else:
+                    with self.scope_hook(stage, **labels):
+                        yield timer
+        except Exception:
+            self.inc("stage_errors_total", stage=stage, **labels)
+            raise
+        finally:
+            self.record_span(stage, time.perf_counter() - started - timer.paused_seconds, **labels)
+
+    def _prometheus_lines(self):
+        lines = []
+        typed = set()
+
+        def header(name, kind):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} {kind}")
+
+        for (name, key), value in sorted(self._counters.items()):
+            metric = f"{self.prefix}_{name}"
+            header(metric, "counter")
+            lines.append(f"{metric}{_format_labels(key)} {value}")
+        for (name, key), value in sorted(self._gauges.items()):
+            metric = f"{self.prefix}_{name}"
+            header(metric, "gauge")
+            lines.append(f"{metric}{_format_labels(key)} {value}")
+        for (name, key), histogram in sorted(self._histograms.items()):
+            metric = f"{self.prefix}_{name}"
+            header(metric, "histogram")
+            cumulative = 0
+            for bound, count in zip(list(histogram.buckets) + ["+Inf"], histogram.counts):
+                cumulative += count
+                lines.append(f"{metric}_bucket{_format_labels(key, [('le', str(bound))])} {cumulative}")
+            lines.append(f"{metric}_sum{_format_labels(key)} {histogram.sum:.6f}")
+            lines.append(f"{metric}_count{_format_labels(key)} {histogram.count}")
+        return lines
+
+    def run_summary(self):
+        with self._lock:
+            counters = [{"name": name, **dict(key), "value": value}
+                        for (name, key), value in sorted(self._run_counters.items())]
+            spans = list(self._run_spans)
+        # Total seconds per stage and per (stage, source) for a quick read
+        totals = {}
+        for span in spans:
+            name = span["stage"] if "source" not in span else f"{span['stage']}:{span['source']}"
+            totals[name] = round(totals.get(name, 0) + span["seconds"], 4)
+        return {
+            "started_at": datetime.fromtimestamp(self._run_started, timezone.utc).isoformat(timespec="seconds"),
+            "duration_seconds": round(time.time() - self._run_started, 3),
+            "totals": totals,
+            "spans": spans,
+            "counters": counters
+        }
+
+    @staticmethod
+    def _write_atomic(path, text):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        # The textfile collector must never see a half-written file
+        os.replace(tmp_path, path)
+
+    def export(self, textfile_path=None, summary_path=None):
+        """Writes the Prometheus textfile and the JSON run summary."""
+        textfile_path = textfile_path or settings.METRICS_TEXTFILE
+        summary_path = summary_path or settings.METRICS_SUMMARY
+        try:
+            if textfile_path:
+                with self._lock:
+                    lines = self._prometheus_lines()
+                self._write_atomic(textfile_path, "\n".join(lines) + "\n")
+            if summary_path:
+                self._write_atomic(summary_path, json.dumps(self.run_summary(), indent=2))
+        except OSError as e:
+            logger.warning(f"Could not export metrics: {e}")
+
+metrics = Metrics()
@@ -1,53 +1,259 @@
+import atexit
+import os
+import queue
+import random
+import sqlite3
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
 from config.settings import settings
 from utils.logger import logger
+from utils.metrics import metrics
+from utils.urls import canonicalize_url
+
+# Telegram rejects messages longer than this (after entity parsing)
+MAX_MESSAGE_LENGTH = 4096
+SEPARATOR = "─────────────────────\n"
+
+def message_length(text):
+    """Length as Telegram counts it (UTF-16 code units; emoji count as two)."""
+    return len(text.encode("utf-16-le")) // 2
+
+def escape_markdown(text):
+    """Escapes the characters legacy Telegram Markdown treats as markup."""
+    text = str(text)
+    for char in ("\\", "_", "*", "`", "["):
+        text = text.replace(char, "\\" + char)
+    return text
+
+class NotifiedJobs:
+    """
+    Persisted set of job keys already alerted. Rows live in SQLite;
+    membership checks hit an in-memory set loaded on first use.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = None
+        self._keys = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS notified_jobs ("
+                "key TEXT PRIMARY KEY, company TEXT, role TEXT, notified_at REAL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def _load(self):
+        if self._keys is None:
+            self._keys = {key for (key,) in self._connect().execute("SELECT key FROM notified_jobs")}
+        return self._keys
+
+    def __contains__(self, key):
+        return key in self._load()
+
+    def add_many(self, jobs):
+        """Records (key, company, role) tuples."""
+        with self._lock:
+            keys = self._load()
+            now = time.time()
+            rows = [(key, company, role, now) for key, company, role in jobs if key not in keys]
+            if rows:
+                keys.update(row[0] for row in rows)
+                conn = self._connect()
+                conn.executemany("INSERT OR IGNORE INTO notified_jobs VALUES (?, ?, ?, ?)", rows)
+                conn.commit()
 
 class TelegramNotifier:
+    """
+    Delivers job alerts over the Bot API. Uses a pooled session with
+    timeouts, retries with backoff (honoring Telegram's `retry_after`),
+    splits long digests at the 4096-char limit, and remembers which jobs
+    were already alerted (persisted) so each job is sent once. With
+    TELEGRAM_ASYNC, sending happens on a background thread.
+    """
+
     def __init__(self):
         self.token = settings.TELEGRAM_BOT_TOKEN
         self.chat_id = settings.TELEGRAM_CHAT_ID
         self.base_url = f"https://api.telegram.org/bot{self.token}/sendMessage"
+        self.asynchronous = settings.TELEGRAM_ASYNC
+        self.max_jobs = settings.TELEGRAM_MAX_JOBS
+
+        self._session = None
+        self._notified = NotifiedJobs(settings.NOTIFIED_INDEX_PATH)
+        # Jobs queued but not delivered yet, so a later cycle doesn't re-queue them
+        self._pending_keys = set()
+        self._lock = threading.Lock()
+        self._queue = None
+        self._worker = None
+
+    def _get_session(self):
+        if self._session is None:
+            self._session = requests.Session()
+            self._session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=2))
+        return self._session
+
+    def build_messages(self, jobs):
+        """
+        Formats (company, role, link, priority) tuples into messages under
+        the size limit. Returns (text, job_count) pairs; jobs are packed in
+        order.
+        """
+        header = "🚀 *New High-Priority Internships Found!*\n\n"
+        messages = []
+        parts = [header]
+        count = 0
+        length = message_length(header)
+        for company, role, link, priority in jobs:
+            block = (
+                f"🏢 *{escape_markdown(company)}*\n"
+                f"💼 {escape_markdown(role)}\n"
+                f"🔗 [Apply Here]({link})\n"
+                f"⭐ Priority: {priority}\n"
+                f"{SEPARATOR}"
+            )
+            block_length = message_length(block)
+            if count and length + block_length > MAX_MESSAGE_LENGTH:
+                messages.append(("".join(parts), count))
+                parts, length, count = [], 0, 0
+            parts.append(block)
+            length += block_length
+            count += 1
+        if count:
+            messages.append(("".join(parts), count))
+        return messages
+
+    def _post(self, text):
+        """Sends one message, retrying 429s, 5xx and network errors. Returns True on success."""
+        payload = {
+            "chat_id": self.chat_id,
+            "text": text,
+            "parse_mode": "Markdown",
+            "disable_web_page_preview": True
+        }
+        for attempt in range(settings.TELEGRAM_MAX_RETRIES + 1):
+            delay = min(2 ** attempt, 30) + random.uniform(0, 0.5)
+            try:
+                response = self._get_session().post(
+                    self.base_url, json=payload, timeout=settings.TELEGRAM_TIMEOUT_SECONDS
+                )
+                if response.status_code == 429:
+                    # Flood control: Telegram says exactly how long to wait
+                    body = response.json() if response.content else {}
+                    delay = float(body.get("parameters", {}).get("retry_after", delay))
+                elif response.status_code < 500:
+                    response.raise_for_status()
+                    return True
+                reason = f"HTTP {response.status_code}"
+            except requests.HTTPError as e:
+                # Other 4xx (e.g. malformed Markdown) won't succeed on retry
+                logger.error(f"Telegram rejected the message: {e}")
+                return False
+            except (requests.RequestException, ValueError) as e:
+                # Network errors, broken responses, undecodable 429 bodies
+                reason = str(e)
+
+            if attempt == settings.TELEGRAM_MAX_RETRIES:
+                logger.error(f"Failed to send Telegram notification after {attempt + 1} attempts: {reason}")
+                return False
+            metrics.inc("retries_total", target="telegram")
+            logger.warning(f"Telegram send failed ({reason}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+        return False
+
+    def _deliver(self, jobs):
+        """Sends `jobs` as one or more messages and records the delivered ones."""
+        delivered = []
+        try:
+            remaining = jobs
+            for text, count in self.build_messages([job[1:5] for job in jobs]):
+                batch, remaining = remaining[:count], remaining[count:]
+                if self._post(text):
+                    delivered.extend(batch)
+                    metrics.inc("notifications_sent_total")
+            if delivered:
+                self._notified.add_many((key, company, role) for key, company, role, _, _ in delivered)
+                logger.info(f"Telegram notification sent for {len(delivered)} jobs.")
+        finally:
+            # Undelivered jobs can be queued again by a later cycle
+            with self._lock:
+                self._pending_keys.difference_update(job[0] for job in jobs)
+
+    def _run_worker(self):
+        while True:
+            jobs = self._queue.get()
+            try:
+                self._deliver(jobs)
+            except Exception as e:
+                logger.error(f"Telegram delivery failed: {e}", exc_info=True)
+            finally:
+                self._queue.task_done()
+
+    def _enqueue(self, jobs):
+        if self._worker is None:
+            self._queue = queue.Queue()
+            self._worker = threading.Thread(target=self._run_worker, name="telegram-sender", daemon=True)
+            self._worker.start()
+            atexit.register(self.flush, 60)
+        self._queue.put(jobs)
+
+    def flush(self, timeout=None):
+        """Waits until queued notifications are delivered (or `timeout` seconds pass)."""
+        if self._queue is None:
+            return
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                logger.warning("Timed out waiting for pending Telegram notifications.")
+                return
+            time.sleep(0.05)
 
     def send_notification(self, df):
         """
-        Sends a notification with the top 5 high-priority jobs.
+        Alerts the top jobs of `df` (already sorted by score) that were
+        never alerted before.
         """
         if not self.token or not self.chat_id:
             logger.warning("Telegram credentials not set. Skipping notification.")
             return
 
-        # Get top 10 high-priority jobs
-        top_jobs = df.head(10)
-        
-        if top_jobs.empty:
-            logger.info("No jobs to notify.")
-            return
+        jobs = []
+        with self._lock:
+            for company, role, link, priority in zip(
+                df.get('Company', ['N/A'] * len(df)), df.get('Role', ['N/A'] * len(df)),
+                df.get('Apply Link', ['#'] * len(df)), df.get('Priority', ['N/A'] * len(df))
+            ):
+                key = canonicalize_url(str(link))
+                if "://" not in key:
+                    # Placeholder link: identify the job by company and role
+                    key = f"{company}|{role}"
+                if key in self._pending_keys or key in self._notified:
+                    continue
+                self._pending_keys.add(key)
+                jobs.append((key, company, role, link, priority))
+                if len(jobs) >= self.max_jobs:
+                    break
 
-        message = "🚀 *New High-Priority Internships Found!*\n\n"
-        
-        for _, row in top_jobs.iterrows():
-            company = row.get('Company', 'N/A')
-            role = row.get('Role', 'N/A')
-            link = row.get('Apply Link', '#')
-            priority = row.get('Priority', 'N/A')
-            
-            message += f"🏢 *{company}*\n"
-            message += f"💼 {role}\n"
-            message += f"🔗 [Apply Here]({link})\n"
-            message += f"⭐ Priority: {priority}\n"
-            message += "─────────────────────\n"
+        if not jobs:
+            logger.info("No new jobs to notify.")
+            return
 
+        if self.asynchronous:
+            self._enqueue(jobs)
+            return
         try:
-            payload = {
-                "chat_id": self.chat_id,
-                "text": message,
-                "parse_mode": "Markdown",
-                "disable_web_page_preview": True
-            }
-            response = requests.post(self.base_url, json=payload)
-            response.raise_for_status()
-            logger.info("Telegram notification sent successfully.")
+            self._deliver(jobs)
         except Exception as e:
-            logger.error(f"Failed to send Telegram notification: {e}")
+            # A failed alert must not stop the cycle before the sync stage
+            logger.error(f"Telegram delivery failed: {e}", exc_info=True)
 
 notifier = TelegramNotifier()
@@ -0,0 +1,115 @@
+import queue
+import threading
+import time
+from utils.logger import logger
+from utils.metrics import metrics
+
+_DONE = object()
+
+class StreamingPipeline:
+    """
+    Streams scraper output through Filter -> Score -> Notify -> Sync in
+    bounded micro-batches. A producer thread runs the scrapers and pushes
+    batches into a bounded queue (back-pressure caps peak memory); the calling
+    thread processes each batch as soon as it arrives, so high-priority hits
+    are alerted and synced while slow sources are still loading.
+    """
+
+    def __init__(self, job_filter, job_scorer, notifier, tracker, batch_size=25, max_pending=8):
+        # `notifier` / `tracker` may be None to skip that stage
+        self.job_filter = job_filter
+        self.job_scorer = job_scorer
+        self.notifier = notifier
+        self.tracker = tracker
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+
+        # Per-run state
+        self._session = None
+        self.stats = {}
+
+    def _reset(self):
+        from utils.dedup import DedupSession
+
+        self._session = DedupSession()
+        self.stats = {
+            "batches": 0,
+            "raw_jobs": 0,
+            "relevant_jobs": 0,
+            "high_priority": 0,
+            # Batches that failed to process or sync (and a failed producer)
+            "failed_batches": 0,
+            "first_alert_seconds": None
+        }
+
+    def run(self, produce):
+        """
+        Runs one streaming cycle. `produce(emit)` must call `emit(source, jobs)`
+        for every batch and return when all sources are done; it runs on a
+        background thread.
+        """
+        self._reset()
+        pending = queue.Queue(maxsize=self.max_pending)
+        started = time.perf_counter()
+
+        def emit(source, jobs):
+            if jobs:
+                pending.put((source, jobs))
+
+        def producer():
+            try:
+                produce(emit)
+            except Exception as e:
+                self.stats["failed_batches"] += 1
+                logger.error(f"Streaming producer failed: {e}", exc_info=True)
+            finally:
+                pending.put(_DONE)
+
+        thread = threading.Thread(target=producer, name="scrape-producer", daemon=True)
+        thread.start()
+
+        while True:
+            item = pending.get()
+            if item is _DONE:
+                break
+            source, jobs = item
+            try:
+                self._process_batch(source, jobs, started)
+            except Exception as e:
+                self.stats["failed_batches"] += 1
+                logger.error(f"Error processing a batch from {source}: {e}", exc_info=True)
+
+        thread.join()
+        logger.info(f"Streaming cycle stats: {self.stats}")
+        return self.stats
+
+    def _process_batch(self, source, jobs, started):
+        self.stats["batches"] += 1
+        self.stats["raw_jobs"] += len(jobs)
+
+        with metrics.span("filter", source=source):
+            df = self.job_filter.filter_jobs(jobs)
+        if df.empty:
+            return
+
+        # Also drops jobs already handled by an earlier batch of this cycle
+        with metrics.span("score", source=source):
+            df = self.job_scorer.process(df, session=self._session)
+        if df.empty:
+            return
+        self.stats["relevant_jobs"] += len(df)
+
+        high = df[df['Priority'] == "High"]
+        if not high.empty:
+            self.stats["high_priority"] += len(high)
+        if not high.empty and self.notifier is not None:
+            if self.stats["first_alert_seconds"] is None:
+                self.stats["first_alert_seconds"] = round(time.perf_counter() - started, 2)
+            logger.info(f"{len(high)} high-priority jobs from {source}, alerting now.")
+            with metrics.span("notify", source=source):
+                self.notifier.send_notification(high)
+
+        if self.tracker is not None:
+            with metrics.span("sync", source=source):
+                if not self.tracker.sync_jobs(df):
+                    self.stats["failed_batches"] += 1
@@ -0,0 +1,176 @@
+"""
+On-demand profiling of one cycle, scoped per stage. While a CycleProfiler
+is active it hooks into `metrics.span`, so every span (cycle, scrape per
+source, filter, score, notify, sync) gets its own cProfile stats,
+tracemalloc allocation sites and sampled stacks. Nothing here is imported
+or installed unless profiling is requested.
+"""
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from utils.logger import logger
+from utils.metrics import metrics
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+class StackSampler(threading.Thread):
+    """
+    Samples the profiled thread's Python stack every `interval` seconds into
+    collapsed-stack counts ("scope;outer;...;inner N"), the input format of
+    flamegraph.pl, speedscope and inferno.
+    """
+
+    def __init__(self, profiler, interval=0.005):
+        super().__init__(name="profile-sampler", daemon=True)
+        self.profiler = profiler
+        self.interval = interval
+        self.counts = {}
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            scope, thread_id = self.profiler.current_scope()
+            if scope is None:
+                continue
+            frame = sys._current_frames().get(thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            key = ";".join([scope] + stack[::-1])
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+class CycleProfiler:
+    """
+    Profiles spans under cProfile ("cpu") and/or tracemalloc ("memory").
+    Nested spans pause their parent, so each scope's stats cover only its
+    own code. Run it around a single-threaded cycle (sync scraping, batch
+    pipeline) so per-source scopes are not mixed.
+    """
+
+    def __init__(self, output_dir, modes=("cpu", "memory"), top=25):
+        self.output_dir = output_dir
+        self.cpu = "cpu" in modes
+        self.memory = "memory" in modes
+        self.top = top
+        self._stack = []
+        self._thread_id = None
+        self._profiles = {}
+        self._allocations = {}
+        self._peaks = {}
+        self._sampler = None
+
+    def current_scope(self):
+        stack = self._stack
+        return (stack[-1]["name"], self._thread_id) if stack else (None, None)
+
+    def start(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        self._thread_id = threading.get_ident()
+        if self.memory:
+            tracemalloc.start()
+        if self.cpu:
+            self._sampler = StackSampler(self)
+            self._sampler.start()
+        metrics.scope_hook = self.scope
+        logger.info(f"Profiling enabled ({'cpu ' if self.cpu else ''}{'memory' if self.memory else ''}) "
+                    f"-> {self.output_dir}")
+
+    def stop(self):
+        metrics.scope_hook = None
+        if self._sampler is not None:
+            self._sampler.stop()
+        if self.memory:
+            tracemalloc.stop()
+
+    def _pause(self, entry):
+        if entry.get("profile") is not None:
+            entry["profile"].disable()
+        if self.memory:
+            entry["peak"] = max(entry["peak"], tracemalloc.get_traced_memory()[1])
+
+    def _resume(self, entry):
+        if self.memory:
+            tracemalloc.reset_peak()
+        if entry.get("profile") is not None:
+            entry["profile"].enable()
+
+    @contextmanager
+    def scope(self, stage, **labels):
+        # Spans from other threads (e.g. HTTP pool callbacks) are not scoped
+        if threading.get_ident() != self._thread_id:
+            yield
+            return
+
+        name = stage if "source" not in labels else f"{stage}:{labels['source']}"
+        entry = {"name": name, "peak": 0}
+        if self._stack:
+            self._pause(self._stack[-1])
+        if self.cpu:
+            entry["profile"] = self._profiles.setdefault(name, cProfile.Profile())
+        if self.memory:
+            entry["snapshot"] = tracemalloc.take_snapshot()
+        self._stack.append(entry)
+        self._resume(entry)
+        try:
+            yield
+        finally:
+            self._pause(entry)
+            self._stack.pop()
+            if self.memory:
+                diff = tracemalloc.take_snapshot().compare_to(entry["snapshot"], "lineno")
+                self._allocations.setdefault(name, []).extend(diff[:self.top])
+                self._peaks[name] = max(self._peaks.get(name, 0), entry["peak"])
+            if self._stack:
+                self._resume(self._stack[-1])
+
+    def _scope_filename(self, name):
+        return "".join(c if c.isalnum() or c in "-_" else "_" for c in name)
+
+    def write(self):
+        """Writes sorted stats, allocation sites and collapsed stacks; returns the output dir."""
+        timings = []
+        for name, profile in self._profiles.items():
+            base = os.path.join(self.output_dir, self._scope_filename(name))
+            stream = io.StringIO()
+            try:
+                stats = pstats.Stats(profile, stream=stream)
+            except TypeError:
+                # Scope never ran any Python code
+                continue
+            profile.dump_stats(f"{base}.prof")
+            timings.append((name, stats.total_tt))
+            stats.sort_stats("cumulative").print_stats(self.top)
+            stats.sort_stats("tottime").print_stats(self.top)
+            with open(f"{base}.txt", "w", encoding="utf-8") as f:
+                f.write(stream.getvalue())
+
+        if self._sampler is not None:
+            with open(os.path.join(self.output_dir, "stacks.collapsed"), "w", encoding="utf-8") as f:
+                for stack, count in sorted(self._sampler.counts.items()):
+                    f.write(f"{stack} {count}\n")
+
+        if self.memory:
+            with open(os.path.join(self.output_dir, "memory.txt"), "w", encoding="utf-8") as f:
+                for name, peak in sorted(self._peaks.items(), key=lambda item: item[1], reverse=True):
+                    f.write(f"== {name}: peak {peak / 2 ** 20:.1f} MiB\n")
+                    sites = sorted(self._allocations.get(name, []), key=lambda s: s.size_diff, reverse=True)
+                    for stat in sites[:self.top]:
+                        f.write(f"  {stat}\n")
+                    f.write("\n")
+
+        for name, seconds in sorted(timings, key=lambda item: item[1], reverse=True)[:5]:
+            logger.info(f"Profile: {name} {seconds:.2f}s of own CPU time")
+        logger.info(f"Profile written to {self.output_dir}")
+        return self.output_dir
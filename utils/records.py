@@ -0,0 +1,85 @@
+import sys
+from operator import attrgetter
+
+class JobRecord:
+    """
+    One scraped posting: the schema every scraper's `parse` returns.
+    Text is whitespace-normalized on construction and a non-string value
+    raises TypeError, so selector drift surfaces at the card that caused
+    it. The low-cardinality fields (source, location, remote status) are
+    interned, so a whole scrape shares one string per distinct value.
+    """
+
+    __slots__ = ("company", "role", "location", "remote", "tags", "link", "date", "source")
+
+    # Attribute -> DataFrame (and sheet) column
+    COLUMNS = {
+        "company": "Company",
+        "role": "Role",
+        "location": "Location",
+        "remote": "Remote/On-site",
+        "tags": "Tags",
+        "link": "Apply Link",
+        "date": "Date",
+        "source": "Source"
+    }
+    # Used when the scraper passes None (element missing)
+    DEFAULTS = {
+        "company": "N/A", "role": "N/A", "location": "Remote", "remote": "",
+        "tags": "", "link": "N/A", "date": "N/A", "source": ""
+    }
+    INTERNED = ("location", "remote", "source")
+
+    def __init__(self, source, role=None, company=None, location=None, remote=None,
+                 tags=None, link=None, date=None):
+        values = {"company": company, "role": role, "location": location, "remote": remote,
+                  "tags": tags, "link": link, "date": date, "source": source}
+        for name, value in values.items():
+            if value is None:
+                value = self.DEFAULTS[name]
+            elif not isinstance(value, str):
+                raise TypeError(f"JobRecord.{name} must be a str, got {type(value).__name__}")
+            else:
+                value = " ".join(value.split())
+            if name in self.INTERNED:
+                value = sys.intern(value)
+            setattr(self, name, value)
+        if not self.source:
+            raise ValueError("JobRecord.source is required")
+
+    def __repr__(self):
+        return f"JobRecord(source={self.source!r}, company={self.company!r}, role={self.role!r})"
+
+    def __eq__(self, other):
+        if not isinstance(other, JobRecord):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def to_dict(self):
+        """Column-keyed dict (JSON, HAR summaries, the work queue)."""
+        return {column: getattr(self, name) for name, column in self.COLUMNS.items()}
+
+    @classmethod
+    def from_dict(cls, row):
+        """Inverse of `to_dict`."""
+        return cls(**{name: row.get(column) for name, column in cls.COLUMNS.items()})
+
+def to_frame(records):
+    """
+    Builds the pipeline DataFrame from records in one pass per column. The
+    interned columns become categoricals (one code per row instead of one
+    string object).
+    """
+    import pandas as pd
+
+    data = {}
+    for name, column in JobRecord.COLUMNS.items():
+        values = list(map(attrgetter(name), records))
+        data[column] = pd.Categorical(values) if name in JobRecord.INTERNED else values
+    return pd.DataFrame(data)
+
+def conform(df):
+    """Adds any schema column a DataFrame lacks, filled with its default."""
+    missing = {column: JobRecord.DEFAULTS[name] for name, column in JobRecord.COLUMNS.items()
+               if column not in df.columns}
+    return df.assign(**missing) if missing else df
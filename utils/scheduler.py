@@ -0,0 +1,110 @@
+import json
+import random
+import time
+from config.settings import settings
+from utils.logger import logger
+from utils.seen_index import seen_index
+
+class SourceSchedule:
+    """Scheduling state of one source, persisted between runs."""
+
+    def __init__(self, name, interval, next_due=0.0, failures=0, rate=None, last_run=None):
+        self.name = name
+        self.interval = interval
+        self.next_due = next_due
+        self.failures = failures
+        # Time of the last successful run, to turn new jobs into a rate
+        self.last_run = last_run
+        # Smoothed new jobs per hour; None until the first successful run
+        self.rate = rate
+
+    def to_json(self):
+        return json.dumps({
+            "interval": self.interval, "next_due": self.next_due,
+            "failures": self.failures, "rate": self.rate, "last_run": self.last_run
+        })
+
+class AdaptiveScheduler:
+    """
+    Gives every source its own crawl interval. After each successful run
+    the interval is re-derived from the source's smoothed yield (new jobs
+    per hour) so that a run finds about `target_new_jobs` postings; busy
+    sources are crawled more often and quiet ones back off toward
+    `max_interval`, by at most 2x per run. Failures back off
+    exponentially. Every due time gets +/- `jitter` so sources don't fire
+    in lockstep.
+    """
+
+    def __init__(self, sources, base_interval=None, min_interval=None, max_interval=None,
+                 target_new_jobs=None, jitter=None, smoothing=0.3):
+        self.base_interval = base_interval or settings.SCRAPE_INTERVAL_MINUTES * 60
+        self.min_interval = min_interval or settings.SCHEDULE_MIN_INTERVAL_MINUTES * 60
+        self.max_interval = max_interval or settings.SCHEDULE_MAX_INTERVAL_MINUTES * 60
+        self.target_new_jobs = target_new_jobs or settings.SCHEDULE_TARGET_NEW_JOBS
+        self.jitter = settings.SCHEDULE_JITTER if jitter is None else jitter
+        self.smoothing = smoothing
+        self.sources = {name: self._load(name) for name in sources}
+
+    def _key(self, name):
+        return f"schedule:{name}"
+
+    def _load(self, name):
+        stored = seen_index.get_meta(self._key(name))
+        if stored:
+            return SourceSchedule(name, **json.loads(stored))
+        # New source: due right away
+        return SourceSchedule(name, self.base_interval)
+
+    def _jittered(self, seconds):
+        return seconds * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def due(self, now=None):
+        """Names of the sources whose next run is due."""
+        now = time.time() if now is None else now
+        return [name for name, source in self.sources.items() if source.next_due <= now]
+
+    def record(self, name, new_jobs, ok=True, now=None):
+        """Updates a source's interval from one run's outcome and schedules its next run."""
+        now = time.time() if now is None else now
+        source = self.sources[name]
+        if ok:
+            source.failures = 0
+            elapsed = now - source.last_run if source.last_run else source.interval
+            source.last_run = now
+            observed = new_jobs / (max(elapsed, self.min_interval) / 3600)
+            source.rate = observed if source.rate is None else (
+                self.smoothing * observed + (1 - self.smoothing) * source.rate
+            )
+            ideal = self.target_new_jobs / source.rate * 3600 if source.rate > 0 else self.max_interval
+            # Move at most 2x per run so one odd run doesn't swing the cadence
+            ideal = min(max(ideal, source.interval / 2), source.interval * 2)
+            source.interval = min(max(ideal, self.min_interval), self.max_interval)
+            delay = source.interval
+        else:
+            source.failures += 1
+            delay = min(self.base_interval * 2 ** source.failures, self.max_interval)
+
+        source.next_due = now + self._jittered(delay)
+        seen_index.set_meta(self._key(name), source.to_json())
+        logger.info(
+            f"Schedule: {name} {'ok' if ok else 'failed'} ({new_jobs} new), "
+            f"next run in {(source.next_due - now) / 60:.0f} min"
+            + (f" (failure #{source.failures})" if not ok else "")
+        )
+
+    def defer(self, name, until):
+        """Pushes a source's next run back to `until` (epoch seconds) without touching its interval."""
+        source = self.sources[name]
+        source.next_due = max(source.next_due, until)
+        seen_index.set_meta(self._key(name), source.to_json())
+
+    def seconds_until_next(self, now=None):
+        now = time.time() if now is None else now
+        return max(0.0, min(source.next_due for source in self.sources.values()) - now)
+
+    def sleep_until_next(self):
+        """Blocks until the earliest source is due (no polling)."""
+        seconds = self.seconds_until_next()
+        if seconds > 0:
+            logger.info(f"Next source due in {seconds / 60:.1f} min. Sleeping.")
+            time.sleep(seconds)
@@ -1,74 +1,132 @@
+import json
+import re
+import numpy as np
 import pandas as pd
+from config.settings import settings
+from utils.filter import map_distinct
+from utils.dedup import job_deduplicator
 from utils.logger import logger
 
+# Declarative scoring table. Each rule adds `weight` when any of its keywords
+# appears (case-insensitive substring) in any of its `fields`, or when a
+# column in `equals` holds exactly the given value. Override it with a JSON
+# file of the same shape via SCORING_RULES_FILE.
+DEFAULT_SCORING_CONFIG = {
+    "rules": [
+        {
+            "name": "visa",
+            "weight": 3,
+            "fields": ["Role", "Location"],
+            "keywords": ["visa", "sponsor", "sponsorship", "h1b"]
+        },
+        {
+            "name": "remote",
+            "weight": 2,
+            "fields": ["Location"],
+            "keywords": ["remote", "work from home", "anywhere"],
+            "equals": {"Remote/On-site": "Remote"}
+        },
+        {
+            "name": "startup",
+            "weight": 1,
+            "fields": ["Source", "Role"],
+            "keywords": ["startup", "early stage", "series a", "wellfound", "yc"]
+        },
+        {
+            # Bonus for specific high-interest keywords
+            "name": "preferred",
+            "weight": 1,
+            "fields": ["Role"],
+            "keywords": ["uiux", "product design", "senior frontend"]
+        }
+    ],
+    # Minimum score for each priority bucket; the lowest bucket also catches
+    # everything below its edge
+    "priorities": {"Low": 0, "Medium": 2, "High": 4}
+}
+
+def load_scoring_config(path=None):
+    """Returns the scoring table from a JSON file, or the built-in default."""
+    if not path:
+        return DEFAULT_SCORING_CONFIG
+    with open(path, encoding="utf-8") as f:
+        config = json.load(f)
+    config.setdefault("priorities", DEFAULT_SCORING_CONFIG["priorities"])
+    logger.info(f"Loaded {len(config['rules'])} scoring rules from {path}")
+    return config
+
 class JobScorer:
-    def __init__(self):
-        # Scoring criteria keywords
-        self.visa_keywords = ["visa", "sponsor", "sponsorship", "h1b"]
-        self.remote_keywords = ["remote", "work from home", "anywhere"]
-        self.startup_keywords = ["startup", "early stage", "series a", "wellfound", "yc"]
-        
-    def calculate_score(self, row):
-        """Calculates a priority score for a single job row."""
-        score = 0
-        role = str(row.get('Role', '')).lower()
-        location = str(row.get('Location', '')).lower()
-        source = str(row.get('Source', '')).lower()
-        
-        # 1. Visa Sponsorship (+3)
-        if any(kw in role for kw in self.visa_keywords) or any(kw in location for kw in self.visa_keywords):
-            score += 3
-            
-        # 2. Remote (+2)
-        if any(kw in location for kw in self.remote_keywords) or row.get('Remote/On-site', '') == 'Remote':
-            score += 2
-            
-        # 3. Startup (+1)
-        if any(kw in source for kw in self.startup_keywords) or any(kw in role for kw in self.startup_keywords):
-            score += 1
-            
-        # 4. Keyword Match (+1)
-        # Assuming the filter already ensured base relevance, 
-        # but we can add bonus for specific high-interest keywords
-        preferred = ["uiux", "product design", "senior frontend"]
-        if any(p in role for p in preferred):
-            score += 1
-            
-        return score
+    def __init__(self, config=None):
+        config = config or load_scoring_config(settings.SCORING_RULES_FILE)
+        self.rules = config["rules"]
+
+        # Compile each rule's keywords into a single alternation
+        self.patterns = {
+            rule["name"]: re.compile("|".join(re.escape(kw) for kw in rule.get("keywords", [])), re.IGNORECASE)
+            for rule in self.rules if rule.get("keywords")
+        }
+
+        # Sorted bucket edges for pd.cut (right-open: score >= edge)
+        buckets = sorted(config["priorities"].items(), key=lambda item: float(item[1]))
+        self.priority_labels = [label for label, _ in buckets]
+        self.priority_bins = [float(edge) for _, edge in buckets][1:]
+
+    def rule_mask(self, df, rule):
+        """Column-wide boolean mask of the rows a rule applies to."""
+        mask = np.zeros(len(df), dtype=bool)
+        pattern = self.patterns.get(rule["name"])
+        if pattern is not None:
+            for field in rule.get("fields", []):
+                if field in df.columns:
+                    hits = map_distinct(df[field], lambda v: bool(pattern.search(str(v))), False)
+                    mask |= hits.to_numpy(dtype=bool)
+        for column, value in rule.get("equals", {}).items():
+            if column in df.columns:
+                mask |= (df[column] == value).to_numpy(dtype=bool)
+        return mask
+
+    def calculate_scores(self, df):
+        """Scores every row at once as a weighted sum of rule masks."""
+        scores = np.zeros(len(df), dtype=np.int64)
+        for rule in self.rules:
+            scores += self.rule_mask(df, rule) * int(rule["weight"])
+        return pd.Series(scores, index=df.index)
+
+    def classify_priorities(self, scores):
+        """Buckets scores into priority labels (High/Medium/Low by default)."""
+        bins = [-np.inf] + self.priority_bins + [np.inf]
+        return pd.cut(scores, bins=bins, labels=self.priority_labels, right=False)
 
     def classify_priority(self, score):
-        """Classifies the score into High, Medium, or Low."""
-        if score >= 4:
-            return "High"
-        elif score >= 2:
-            return "Medium"
-        else:
-            return "Low"
-
-    def process(self, df):
+        """Classifies a single score into High, Medium, or Low."""
+        return self.classify_priorities(pd.Series([score])).iloc[0]
+
+    def process(self, df, session=None):
         """
         Removes duplicates, assigns scores, and classifies priority.
+        `session` (a utils.dedup.DedupSession) carries duplicate clusters
+        across calls (streaming).
         """
         if df.empty:
             return df
 
         # 1. Deduplication
-        # Key: Company + Role + Apply Link
+        # Canonical apply link, or same company with a near-duplicate title
         initial_count = len(df)
-        df = df.drop_duplicates(subset=['Company', 'Role', 'Apply Link'], keep='first')
+        df = job_deduplicator.deduplicate(df, session=session)
         dedup_count = initial_count - len(df)
         if dedup_count > 0:
             logger.info(f"Removed {dedup_count} duplicate listings.")
 
         # 2. Assign Scores
-        df['Score'] = df.apply(self.calculate_score, axis=1)
-        
+        scores = self.calculate_scores(df)
+
         # 3. Classify Priority
-        df['Priority'] = df['Score'].apply(self.classify_priority)
-        
+        df = df.assign(Score=scores, Priority=self.classify_priorities(scores))
+
         # Sort by Score descending
         df = df.sort_values(by='Score', ascending=False)
-        
+
         return df
 
 job_scorer = JobScorer()
@@ -0,0 +1,120 @@
+import os
+import sqlite3
+import threading
+import time
+from config.settings import settings
+from utils.logger import logger
+
+# Bump when the canonical link format changes; the index is then rebuilt
+# from the sheet on the next reconciliation.
+KEY_VERSION = 3
+
+class SeenJobsIndex:
+    """
+    Durable local index of every job ever synced to the tracker, keyed by
+    the canonical apply link (see utils/urls.canonicalize_url). Rows live in
+    SQLite; membership checks hit an in-memory hash set loaded once per
+    process, so dedup cost stays flat no matter how long the tracker
+    history gets.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = None
+        self._links = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS seen_jobs ("
+                "link TEXT PRIMARY KEY, company TEXT, role TEXT, source TEXT, first_seen REAL)"
+            )
+            self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            self._conn.commit()
+            self._migrate()
+        return self._conn
+
+    def _migrate(self):
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'key_version'").fetchone()
+        version = int(row[0]) if row else 1
+        if version == KEY_VERSION:
+            return
+        logger.info(f"Seen-jobs index key format changed (v{version} -> v{KEY_VERSION}). Rebuilding.")
+        self._conn.execute("DELETE FROM seen_jobs")
+        # Forget the sheet watermark so the next reconciliation re-reads every
+        # link. Other meta state (crawl watermarks, schedules, circuit
+        # breakers) outlives the index.
+        self._conn.execute(
+            "DELETE FROM meta WHERE key LIKE 'sheet_last_row:%' OR key = 'last_reconciled_at'"
+        )
+        self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('key_version', ?)", (str(KEY_VERSION),))
+        self._conn.commit()
+
+    def _load(self):
+        if self._links is None:
+            rows = self._connect().execute("SELECT link FROM seen_jobs")
+            self._links = {link for (link,) in rows}
+            logger.info(f"Loaded {len(self._links)} links from seen-jobs index.")
+        return self._links
+
+    def __contains__(self, link):
+        return link in self._load()
+
+    def __len__(self):
+        return len(self._load())
+
+    def add_many(self, jobs):
+        """Records (link, company, role, source) tuples; returns how many were new."""
+        with self._lock:
+            links = self._load()
+            now = time.time()
+            new_rows = []
+            for link, company, role, source in jobs:
+                if link and link not in links:
+                    links.add(link)
+                    new_rows.append((link, company, role, source, now))
+            if new_rows:
+                conn = self._connect()
+                conn.executemany("INSERT OR IGNORE INTO seen_jobs VALUES (?, ?, ?, ?, ?)", new_rows)
+                conn.commit()
+            return len(new_rows)
+
+    def recent(self, after_rowid=0, limit=50000):
+        """
+        (rowid, link, company, role) of the newest `limit` rows added after
+        `after_rowid`, oldest first. Reads nothing (and creates no file)
+        when the index doesn't exist yet.
+        """
+        if self._conn is None and not os.path.exists(self.path):
+            return []
+        rows = self._connect().execute(
+            "SELECT rowid, link, company, role FROM seen_jobs WHERE rowid > ? ORDER BY rowid DESC LIMIT ?",
+            (after_rowid, limit)
+        ).fetchall()
+        return rows[::-1]
+
+    def get_meta(self, key, default=None):
+        row = self._connect().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key, value):
+        with self._lock:
+            conn = self._connect()
+            conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, str(value)))
+            conn.commit()
+
+    def needs_reconcile(self, interval_hours):
+        """True when the sheet hasn't been re-read within `interval_hours`."""
+        last = float(self.get_meta("last_reconciled_at", 0))
+        return time.time() - last >= interval_hours * 3600
+
+    def mark_reconciled(self):
+        self.set_meta("last_reconciled_at", time.time())
+
+seen_index = SeenJobsIndex(settings.SEEN_INDEX_PATH)
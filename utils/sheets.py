@@ -1,8 +1,12 @@
+import re
 import gspread
+from gspread.utils import rowcol_to_a1
 from oauth2client.service_account import ServiceAccountCredentials
 from config.settings import settings
 from utils.logger import logger
-import pandas as pd
+from utils.seen_index import seen_index
+from utils.urls import canonicalize_url
+from utils.records import conform
 
 class InternshipTracker:
     def __init__(self):
@@ -21,8 +25,30 @@ class InternshipTracker:
             "Company", "Role", "Location", "Remote/Visa", 
             "Link", "Date Posted", "Status", "Priority", "Notes"
         ]
+        # Column letter of "Link" (e.g. "E"), used for column-scoped reads
+        self.link_column = re.sub(r"\d", "", rowcol_to_a1(1, self.columns.index("Link") + 1))
+
+    @property
+    def _last_row_key(self):
+        # Watermark of the last sheet row folded into the seen-jobs index
+        return f"sheet_last_row:{settings.SPREADSHEET_ID}:{self.sheet_name}"
+
+    def _refresh_token(self):
+        """Refreshes the OAuth token of the long-lived client if it expired."""
+        if getattr(self.creds, "access_token_expired", False):
+            self.creds.get_access_token()
+            logger.info("Refreshed Google Sheets access token.")
 
     def authenticate(self):
+        # Reuse the authorized client and resolved worksheet across cycles
+        if self.sheet is not None:
+            try:
+                self._refresh_token()
+                return True
+            except Exception as e:
+                logger.warning(f"Token refresh failed, re-authenticating: {e}")
+                self.sheet = None
+
         try:
             self.creds = ServiceAccountCredentials.from_json_keyfile_name(
                 settings.GOOGLE_SHEETS_CREDENTIAL_FILE, self.scope
@@ -40,6 +66,7 @@ class InternshipTracker:
                 # Create sheet if not found
                 self.sheet = self.spreadsheet.add_worksheet(title=self.sheet_name, rows="1000", cols=str(len(self.columns)))
                 self.sheet.append_row(self.columns)
+                seen_index.set_meta(self._last_row_key, 1)
                 logger.info(f"Created new sheet: {self.sheet_name}")
                 
             return True
@@ -47,53 +74,99 @@ class InternshipTracker:
             logger.error(f"Failed to authenticate with Google Sheets: {e}")
             return False
 
+    def reconcile(self):
+        """
+        Folds rows added to the sheet by hand or by another machine into the
+        local seen-jobs index. Only the Link column is read, and only for rows
+        appended since the last known row.
+        """
+        last_row = int(seen_index.get_meta(self._last_row_key, 1))  # row 1 is the header
+        values = self.sheet.get(f"{self.link_column}{last_row + 1}:{self.link_column}")
+        added = seen_index.add_many(
+            (canonicalize_url(str(row[0])), '', '', '') for row in values if row
+        )
+        seen_index.set_meta(self._last_row_key, last_row + len(values))
+        seen_index.mark_reconciled()
+        logger.info(
+            f"Reconciled seen-jobs index with {len(values)} sheet rows after row {last_row}: "
+            f"{added} links added, {len(seen_index)} total."
+        )
+
+    def _advance_last_row(self, response):
+        """
+        Moves the row watermark past our own append, but only when it directly
+        follows the known rows; otherwise the gap is left for `reconcile`.
+        """
+        updated_range = (response or {}).get("updates", {}).get("updatedRange", "")
+        match = re.search(r"[A-Z]+(\d+):[A-Z]+(\d+)$", updated_range)
+        if not match:
+            return
+        first_row, end_row = int(match.group(1)), int(match.group(2))
+        if first_row == int(seen_index.get_meta(self._last_row_key, 1)) + 1:
+            seen_index.set_meta(self._last_row_key, end_row)
+
     def sync_jobs(self, df):
         """
-        Appends only new jobs to the sheet, avoiding duplicates.
+        Appends only new jobs to the sheet, avoiding duplicates. Returns
+        False when the sheet could not be reached.
         """
         if not self.authenticate():
-            return
+            return False
 
         if df.empty:
             logger.info("No data to sync.")
-            return
+            return True
 
-        # 1. Fetch existing data to check for duplicates
-        existing_records = self.sheet.get_all_records()
-        existing_links = {str(r.get('Link', '')) for r in existing_records} if existing_records else set()
+        # 1. Dedup against the local seen-jobs index; the sheet itself is only
+        #    re-read for periodic reconciliation
+        if seen_index.needs_reconcile(settings.SHEETS_RECONCILE_HOURS):
+            self.reconcile()
 
         # 2. Map DataFrame to requirement columns
-        # Scraper DataFrame usually has: Role, Company, Location, Tags, Apply Link, Date, Score, Priority
+        # Every JobRecord column is present (see utils/records.py), plus Score and Priority
+        df = conform(df)
+        priorities = df['Priority'] if 'Priority' in df.columns else ['Low'] * len(df)
         new_rows = []
-        for _, row in df.iterrows():
-            link = str(row.get('Apply Link', ''))
+        new_keys = []
+        batch_keys = set()
+        for company, role, location, tags, link, date, source, priority in zip(
+            df['Company'], df['Role'], df['Location'], df['Tags'], df['Apply Link'],
+            df['Date'], df['Source'], priorities
+        ):
+            link = str(link)
+            key = canonicalize_url(link)
             
-            # Cloud-side Deduplication: Skip if link already exists in the sheet
-            if link in existing_links:
+            # Cloud-side Deduplication: Skip if the job was already synced
+            if key in seen_index or key in batch_keys:
                 continue
+            batch_keys.add(key)
 
             # Format the data for the sheet columns
             # Remote/Visa combines location tags and visa info
-            remote_visa = f"{row.get('Location', '')} | {row.get('Tags', '')}"
+            remote_visa = f"{location} | {tags}"
             
             sheet_row = [
-                row.get('Company', 'N/A'),
-                row.get('Role', 'N/A'),
-                row.get('Location', 'N/A'),
+                company,
+                role,
+                location,
                 remote_visa,
                 link,
-                row.get('Date', 'N/A'),
+                date,
                 "Not Applied", # Default Status
-                row.get('Priority', 'Low'),
+                priority,
                 ""             # Empty Notes
             ]
             new_rows.append(sheet_row)
+            new_keys.append((key, company, role, source))
 
         # 3. Append only new rows
         if new_rows:
-            self.sheet.append_rows(new_rows, value_input_option='USER_ENTERED')
+            response = self.sheet.append_rows(new_rows, value_input_option='USER_ENTERED')
+            seen_index.add_many(new_keys)
+            self._advance_last_row(response)
             logger.info(f"Successfully added {len(new_rows)} new unique jobs to Google Sheets.")
         else:
             logger.info("No new unique jobs found to append.")
+        return True
 
 tracker = InternshipTracker()
@@ -0,0 +1,58 @@
+import re
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Query parameters that only track clicks/campaigns on any site: utm_*
+# (matched by prefix) and ad-network click ids
+TRACKING_PARAMS = {"gclid", "fbclid", "msclkid", "mc_cid", "mc_eid"}
+
+# Site-specific tracking parameters: (host regex, params). Generic names
+# like "from" or "t" can identify a posting elsewhere, so they are only
+# dropped on the hosts known to use them for tracking.
+SITE_TRACKING_PARAMS = [
+    (re.compile(r"(^|\.)indeed\.com$"), {
+        "tk", "vjk", "advn", "adid", "sjdu", "acatk", "camk", "xkcb", "xpse", "xfps",
+        "iaid", "from", "cmp", "pub", "sp", "t"
+    }),
+]
+
+# Known redirect/click-tracking URL shapes -> (query param holding the job
+# id, canonical URL template)
+REDIRECT_PATTERNS = [
+    # Indeed: /rc/clk?jk=..., /pagead/clk?jk=..., /viewjob?jk=...
+    (re.compile(r"(^|\.)indeed\.com$"), re.compile(r"^/(rc/clk|pagead/clk|viewjob|applystart)"), "jk",
+     "https://www.indeed.com/viewjob?jk={}"),
+]
+
+def canonicalize_url(url):
+    """
+    Maps the many URLs a single posting is reachable under to one key:
+    lowercases scheme/host, drops "www.", fragments, trailing slashes and
+    tracking parameters (generic ones everywhere, site-specific ones on
+    their own hosts), and resolves known redirect links (e.g. Indeed's
+    /rc/clk?jk=...) to the job's canonical page.
+    """
+    url = (url or "").strip()
+    parts = urlsplit(url)
+    if not parts.netloc:
+        # Placeholders like "N/A" are kept as-is
+        return url
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    params = parse_qsl(parts.query, keep_blank_values=False)
+
+    for host_re, path_re, id_param, template in REDIRECT_PATTERNS:
+        if host_re.search(host) and path_re.search(parts.path):
+            job_id = dict(params).get(id_param)
+            if job_id:
+                return template.format(job_id)
+
+    dropped = set(TRACKING_PARAMS)
+    for site_re, site_params in SITE_TRACKING_PARAMS:
+        if site_re.search(host):
+            dropped |= site_params
+    query = urlencode(sorted(
+        (k, v) for k, v in params if not k.lower().startswith("utm_") and k.lower() not in dropped
+    ))
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower() or "https", host, path, query, ""))